@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+blit_formats.py - per-blit cost of resource surfaces before and after the
+resload load-time optimizer.
+
+Run from the project root:  python -m bench.blit_formats [--blits N]
+"""
+
+import argparse
+import os
+import time
+
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+import pygame
+
+from pygametest import resload
+
+RES_DIR = "./res/"
+SAMPLES = [
+    "bgs/new3.png",         # opaque background
+    "bgs/ring.png",         # wide layer with alpha
+    "chr/0/idle/0001.png",  # sparse character frame
+    "chr/1/punch/0010.png",
+    "title/main.png",
+]
+
+
+def parse_args():
+    p = argparse.ArgumentParser(description="Benchmark blits of raw vs optimized resource surfaces")
+    p.add_argument("--blits", type=int, default=200, help="Blits per measurement (default: 200)")
+    return p.parse_args()
+
+
+def time_blits(target: pygame.Surface, surf: pygame.Surface, count: int, flags: int = 0) -> float:
+    """Return microseconds per blit."""
+    start = time.perf_counter()
+    for _ in range(count):
+        target.blit(surf, (0, 0), special_flags=flags)
+    return (time.perf_counter() - start) / count * 1e6
+
+
+def main():
+    args = parse_args()
+    pygame.init()
+    screen = pygame.display.set_mode((1920, 1080))
+    target = pygame.Surface(screen.get_size()).convert()
+
+    print(f"{'resource':<24}{'raw':>10}{'alpha':>10}{'optimized':>12}{'premul':>10}   kind")
+    for key in SAMPLES:
+        raw = pygame.image.load(os.path.join(RES_DIR, key))
+
+        resload.set_surface_optimizer(True, premultiply=False)
+        opt = resload.optimize_surface(raw)
+        resload.set_surface_optimizer(True, premultiply=True)
+        pre = resload.optimize_surface(raw)
+
+        if not opt.get_flags() & pygame.SRCALPHA:
+            kind = "opaque"
+        elif opt.get_flags() & (pygame.RLEACCEL | pygame.RLEACCELOK):
+            kind = "alpha+rle"
+        else:
+            kind = "alpha"
+
+        t_raw = time_blits(target, raw, args.blits)
+        t_alpha = time_blits(target, raw.convert_alpha(), args.blits)
+        t_opt = time_blits(target, opt, args.blits)
+        t_pre = time_blits(target, pre, args.blits, resload.blit_flags(pre))
+        print(f"{key:<24}{t_raw:>9.0f}u{t_alpha:>9.0f}u{t_opt:>11.0f}u{t_pre:>9.0f}u   {kind}")
+
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+bulk_entities.py - per-frame update cost of many moving entities, integrated
+one by one (Entity) or together in a NumPy ComponentStore (BulkEntity).
+
+Run from the project root:  python -m bench.bulk_entities [--entities 100,1000,5000] [--frames N]
+"""
+
+import argparse
+import os
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+import pygame
+
+from pygametest.entity import Entity
+from pygametest.components import ComponentStore, BulkEntity
+from pygametest.scene_base import Scene
+
+
+class BenchScene(Scene):
+    def update(self, dt):
+        super().update(dt)
+
+
+class Manager:
+    width, height = 1920, 1080
+
+
+def parse_args():
+    p = argparse.ArgumentParser(description="Benchmark per-entity vs vectorized entity integration")
+    p.add_argument("--entities", type=str, default="100,1000,5000", help="Comma-separated entity counts (default: 100,1000,5000)")
+    p.add_argument("--frames", type=int, default=200, help="Frames per measurement (default: 200)")
+    return p.parse_args()
+
+
+def measure(bulk: bool, count: int, frames: int) -> float:
+    """Return microseconds per Scene.update."""
+    image = pygame.Surface((2, 2), pygame.SRCALPHA).convert_alpha()
+    scene = BenchScene(manager=Manager())
+    store = ComponentStore() if bulk else None
+    if bulk:
+        scene.entities.append(store)
+    for i in range(count):
+        pos = ((i * 37) % 1900, (i * 53) % 1060)
+        ent = BulkEntity(store, pos, image) if bulk else Entity(pos, image)
+        ent.vel.x = (i % 7) * 10 - 30
+        ent.acc.y = 98.0  # falling debris
+        scene.entities.append(ent)
+
+    start = time.perf_counter()
+    for _ in range(frames):
+        scene.update(1 / 60)
+    return (time.perf_counter() - start) / frames * 1e6
+
+
+def main():
+    args = parse_args()
+    pygame.init()
+    pygame.display.set_mode((1920, 1080))
+
+    print(f"{'entities':>8}{'entity us':>11}{'bulk us':>10}{'speedup':>9}")
+    for count in (int(c) for c in args.entities.split(",")):
+        entity_us = measure(False, count, args.frames)
+        bulk_us = measure(True, count, args.frames)
+        print(f"{count:>8}{entity_us:>11.0f}{bulk_us:>10.0f}{entity_us / bulk_us:>8.2f}x")
+
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+collisions.py - per-frame cost of hitbox vs hurtbox checks for N fighters,
+checking every pair by hand or through the CollisionWorld sweep-and-prune broadphase.
+
+Run from the project root:  python -m bench.collisions [--actors 2,8,64] [--frames N]
+"""
+
+import argparse
+import random
+import time
+
+import pygame
+
+from pygametest.collision import CollisionWorld, LAYER_HURTBOX, LAYER_HITBOX
+
+
+class Actor:
+    """Fighter stand-in: a rect, an attack hitbox half of the time, and a hit counter."""
+
+    def __init__(self, rng: random.Random, arena_w: int):
+        self.rect = pygame.Rect(rng.randrange(0, arena_w - 200), 580, 200, 400)
+        self.hitbox = self.rect.inflate(100, -200).move(100, 0) if rng.random() < 0.5 else None
+        self.hits = 0
+
+    def on_collision(self, other):
+        other.hits += 1
+
+
+def make_actors(count: int) -> list[Actor]:
+    rng = random.Random(count)
+    arena_w = max(1920, count * 300)  # keep the crowd density of a 1v1 stage
+    return [Actor(rng, arena_w) for _ in range(count)]
+
+
+def pairwise(actors: list[Actor]):
+    for a in actors:
+        if a.hitbox is None:
+            continue
+        for b in actors:
+            if a is not b and a.hitbox.colliderect(b.rect):
+                a.on_collision(b)
+
+
+def parse_args():
+    p = argparse.ArgumentParser(description="Benchmark pairwise vs sweep-and-prune broadphase hit detection")
+    p.add_argument("--actors", type=str, default="2,8,64", help="Comma-separated actor counts (default: 2,8,64)")
+    p.add_argument("--frames", type=int, default=2000, help="Frames per measurement (default: 2000)")
+    return p.parse_args()
+
+
+def main():
+    args = parse_args()
+
+    print(f"{'actors':>6}{'pairwise us':>13}{'world us':>10}{'speedup':>9}{'hits':>7}")
+    for count in (int(c) for c in args.actors.split(",")):
+        actors = make_actors(count)
+        start = time.perf_counter()
+        for _ in range(args.frames):
+            pairwise(actors)
+        pairwise_us = (time.perf_counter() - start) / args.frames * 1e6
+        expected = sum(a.hits for a in actors)
+
+        actors = make_actors(count)
+        world = CollisionWorld()
+        for actor in actors:
+            world.add(actor, LAYER_HURTBOX)
+            world.add(actor, LAYER_HITBOX, LAYER_HURTBOX, shape="hitbox")
+        start = time.perf_counter()
+        for _ in range(args.frames):
+            world.step()
+        world_us = (time.perf_counter() - start) / args.frames * 1e6
+        hits = sum(a.hits for a in actors)
+        assert hits == expected, (hits, expected)
+
+        print(f"{count:>6}{pairwise_us:>13.1f}{world_us:>10.1f}{pairwise_us / world_us:>8.2f}x{hits // args.frames:>7}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+entity_render.py - per-frame cost of Scene.update + Scene.render for many plain
+entities, comparing Entity (cached camera offsets, no temporary Vector2s) with
+a copy of the previous Vector2-based update/draw path: time per frame, and the
+peak memory allocated during a frame as traced by tracemalloc (above what was
+allocated when the frame started), in a separate untimed run. Temporaries freed
+right away count only as long as they overlap, so this is a peak, not a count.
+
+Run from the project root:  python -m bench.entity_render [--entities 100,500] [--frames N]
+"""
+
+import argparse
+import os
+import time
+import tracemalloc
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+import pygame
+
+from pygametest.entity import Entity
+from pygametest.resload import to_screen
+from pygametest.scene_base import Scene
+
+
+class LegacyEntity(Entity):
+    """Entity with the previous per-call Vector2 camera offset and draw."""
+
+    def calc_cam_offset(self, cam_pos):
+        m_cam_pos = -cam_pos
+        return pygame.math.Vector2(m_cam_pos.x * self.parallax, m_cam_pos.y * self.parallax) if self.scroll else pygame.math.Vector2(0, 0)
+
+    def update(self, dt):
+        self.vel += self.acc * dt
+        self.pos += self.vel * dt
+        self.image = self._orig_image
+        self.rect.topleft = (int(self.pos.x), int(self.pos.y))
+
+    def draw(self, surface, cam_pos):
+        cam_off = self.calc_cam_offset(cam_pos)
+        surface.blit(self.image, to_screen(self.rect.x + cam_off.x, self.rect.y + cam_off.y), special_flags=self.blend_flags)
+
+
+class BenchScene(Scene):
+    def update(self, dt):
+        for ent in self.entities:
+            ent.update(dt)
+
+
+class Manager:
+    width, height = 1920, 1080
+
+
+def parse_args():
+    p = argparse.ArgumentParser(description="Benchmark Scene.update + Scene.render time and peak traced memory for many entities")
+    p.add_argument("--entities", type=str, default="100,500", help="Comma-separated entity counts (default: 100,500)")
+    p.add_argument("--frames", type=int, default=300, help="Frames per measurement (default: 300)")
+    return p.parse_args()
+
+
+def measure(cls, count: int, frames: int, screen: pygame.Surface, moving: bool) -> tuple[float, float]:
+    """Return microseconds per frame and the average peak bytes allocated during a frame."""
+    image = pygame.Surface((2, 2), pygame.SRCALPHA).convert_alpha()  # keep blit cost out of the way
+    scene = BenchScene(manager=Manager())
+    for i in range(count):
+        ent = cls(((i * 37) % 1900, (i * 53) % 1060), image)
+        ent.parallax = 0.5 + (i % 3) * 0.25
+        scene.entities.append(ent)
+
+    def frame(n):
+        if moving:
+            scene.cam_pos.x = n % 200
+        scene.update(1 / 60)
+        scene.render(screen)
+
+    for n in range(10):
+        frame(n)  # warm up caches
+
+    start = time.perf_counter()
+    for n in range(frames):
+        frame(n)
+    us = (time.perf_counter() - start) / frames * 1e6
+
+    tracemalloc.start()
+    peak = 0
+    for n in range(frames):
+        before = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+        frame(n)
+        peak += tracemalloc.get_traced_memory()[1] - before
+    tracemalloc.stop()
+    return us, peak / frames
+
+
+def main():
+    args = parse_args()
+    pygame.init()
+    screen = pygame.display.set_mode((1920, 1080))
+
+    print(f"{'entities':>8}  {'camera':<7}{'legacy us':>11}{'entity us':>11}{'speedup':>9}{'legacy peak B':>15}{'entity peak B':>15}")
+    for count in (int(c) for c in args.entities.split(",")):
+        for moving in (False, True):
+            legacy_us, legacy_bytes = measure(LegacyEntity, count, args.frames, screen, moving)
+            new_us, new_bytes = measure(Entity, count, args.frames, screen, moving)
+            print(f"{count:>8}  {'moving' if moving else 'still':<7}{legacy_us:>11.0f}{new_us:>11.0f}{legacy_us / new_us:>8.2f}x"
+                  f"{legacy_bytes:>15.0f}{new_bytes:>15.0f}")
+
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
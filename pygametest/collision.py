@@ -0,0 +1,104 @@
+"""
+pygametest.collision - broadphase collision world for entity rects.
+
+Provides:
+- CollisionWorld()
+- LAYER_HURTBOX, LAYER_HITBOX
+
+Entities are added as one or more bodies: a rect attribute to read (rect,
+hitbox, ...), the layer bits the body is on and the mask of layers it reacts to.
+step() sorts the current rects by their left edge and, for every body with a
+mask, only looks at the bodies within reach along x (sweep and prune). For
+every pair where a's mask matches b's layer and the rects overlap it calls
+a.entity.on_collision(b.entity). Bodies of the same entity
+never collide, and an attribute that is None (no attack hitbox right now) is skipped.
+
+Pairs are resolved in the order the bodies were added, and each rect is read
+again right before its pair is tested, so a callback that changes an entity
+(a hit cancelling the victim's own attack) affects the pairs after it, the
+same as checking them one by one by hand.
+"""
+
+from bisect import bisect_left
+
+LAYER_HURTBOX = 1 << 0  # can be hit (usually the entity rect)
+LAYER_HITBOX = 1 << 1  # deals hits (attacks, projectiles)
+
+
+def _left_edge(target):
+    return target[0]
+
+
+class CollisionWorld:
+    """Sweep-and-prune broadphase over entity rects along x, in logical coordinates."""
+
+    def __init__(self):
+        self._bodies = []  # (entity, rect attribute, layer, mask), in order added
+        self._hitters = []  # (index, entity, rect attribute, mask) of bodies with a mask
+        self._targets = []  # (index, entity, rect attribute, layer) of bodies some mask matches
+
+    def add(self, entity, layer: int, mask: int = 0, shape: str = "rect"):
+        """Add a body for entity: getattr(entity, shape) is its rect (or None)."""
+        self._bodies.append((entity, shape, layer, mask))
+        self._index()
+
+    def remove(self, entity):
+        """Remove every body of entity."""
+        self._bodies = [body for body in self._bodies if body[0] is not entity]
+        self._index()
+
+    def clear(self):
+        self._bodies = []
+        self._index()
+
+    def _index(self):
+        masks = 0
+        for _entity, _shape, _layer, mask in self._bodies:
+            masks |= mask
+        self._hitters = [(i, entity, shape, mask) for i, (entity, shape, _layer, mask) in enumerate(self._bodies) if mask]
+        self._targets = [(i, entity, shape, layer) for i, (entity, shape, layer, _mask) in enumerate(self._bodies) if layer & masks]
+
+    def candidate_pairs(self) -> list[tuple[int, int]]:
+        """Body index pairs (a, b) whose rects overlap where a's mask matches b's layer, sorted."""
+        hitters = []  # (index, entity, rect, mask)
+        for a, entity, shape, mask in self._hitters:
+            rect = getattr(entity, shape)
+            if rect is not None:
+                hitters.append((a, entity, rect, mask))
+        if not hitters:
+            return []
+        targets = []  # (left, index, entity, rect, layer)
+        widest = 0
+        for b, entity, shape, layer in self._targets:
+            rect = getattr(entity, shape)
+            if rect is not None:
+                targets.append((rect.left, b, entity, rect, layer))
+                if rect.width > widest:
+                    widest = rect.width
+        targets.sort(key=_left_edge)
+        lefts = [t[0] for t in targets]
+
+        pairs = []
+        for a, entity_a, rect, mask in hitters:
+            # only targets starting less than the widest target before our left edge can reach us
+            window = targets[bisect_left(lefts, rect.left - widest):bisect_left(lefts, rect.right)]
+            found = [b for _left, b, entity_b, rect_b, layer in window
+                     if mask & layer and entity_a is not entity_b and rect.colliderect(rect_b)]
+            if found:
+                found.sort()
+                pairs.extend([(a, b) for b in found])
+        return pairs
+
+    def step(self) -> list[tuple]:
+        """Resolve collisions, calling on_collision. Returns the (entity, other) pairs that collided."""
+        bodies = self._bodies
+        hits = []
+        for a, b in self.candidate_pairs():
+            entity_a, shape_a, _layer, _mask = bodies[a]
+            entity_b, shape_b, _layer, _mask = bodies[b]
+            rect_a = getattr(entity_a, shape_a)
+            rect_b = getattr(entity_b, shape_b)
+            if rect_a is not None and rect_b is not None and rect_a.colliderect(rect_b):
+                entity_a.on_collision(entity_b)
+                hits.append((entity_a, entity_b))
+        return hits
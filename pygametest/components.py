@@ -0,0 +1,236 @@
+import pygame
+from .entity import Entity
+from .resload import logical_size
+from .rotations import get_rotated
+
+try:
+    import numpy as np
+except ImportError:  # optional, only needed by ComponentStore
+    np = None
+
+"""
+pygametest.components - NumPy-backed motion components for many entities.
+
+Provides:
+- HAS_NUMPY
+- ComponentStore(capacity=64)
+- BulkEntity(store, pos, image=None, size=(32, 32), group=None)
+
+A ComponentStore keeps position, velocity, acceleration, angle and angular
+velocity of its entities in contiguous arrays and integrates all of them in one
+vectorized step. Add the store to a scene before its entities, so its update()
+runs first:
+
+    store = ComponentStore()
+    self.entities.append(store)
+    for ...:
+        self.entities.append(BulkEntity(store, pos, image))
+
+BulkEntity is an Entity whose pos/vel/acc/angle/angular_velocity read and write
+its row of the store (pos.x += 1 etc. work in place, arithmetic like pos + vel
+needs pygame.Vector2(ent.pos)), so scenes and Entity.draw use it unchanged.
+NumPy is optional; without it, creating a ComponentStore raises ImportError.
+"""
+
+HAS_NUMPY = np is not None
+
+
+class ComponentStore:
+    """Motion components of BulkEntities, integrated together by update(dt)."""
+
+    def __init__(self, capacity: int = 64):
+        if np is None:
+            raise ImportError("ComponentStore needs numpy (pip install numpy)")
+        self.pos = np.zeros((capacity, 2))
+        self.vel = np.zeros((capacity, 2))
+        self.acc = np.zeros((capacity, 2))
+        self.angle = np.zeros(capacity)
+        self.angular_velocity = np.zeros(capacity)
+        self._count = 0  # rows in use or freed, the rest is spare capacity
+        self._free = []
+        # integer positions and angles as of the last update(), as lists for cheap per-entity reads
+        self.rect_x = []
+        self.rect_y = []
+        self.angles = []
+
+    def __len__(self) -> int:
+        return self._count - len(self._free)
+
+    def add(self, pos) -> int:
+        """Take a row for a new entity at pos, return its index."""
+        if self._free:
+            index = self._free.pop()
+        else:
+            if self._count == len(self.pos):
+                self._grow()
+            index = self._count
+            self._count += 1
+        self.pos[index] = pos
+        return index
+
+    def remove(self, index: int):
+        """Free a row. It is zeroed so integration leaves it alone."""
+        for arr in (self.pos, self.vel, self.acc, self.angle, self.angular_velocity):
+            arr[index] = 0
+        self._free.append(index)
+
+    def _grow(self):
+        capacity = len(self.pos) * 2
+        for name in ("pos", "vel", "acc", "angle", "angular_velocity"):
+            old = getattr(self, name)
+            arr = np.zeros((capacity,) + old.shape[1:])
+            arr[:len(old)] = old
+            setattr(self, name, arr)
+
+    def update(self, dt: float):
+        """Euler step for every row, same order of operations as Entity.update."""
+        n = self._count
+        vel = self.vel[:n]
+        vel += self.acc[:n] * dt
+        self.pos[:n] += vel * dt
+        spinning = self.angular_velocity[:n] != 0
+        if spinning.any():
+            angle = self.angle[:n]
+            angle[spinning] = (angle[spinning] + self.angular_velocity[:n][spinning] * dt) % 360
+        pos = self.pos[:n]
+        self.rect_x = pos[:, 0].astype(np.int64).tolist()  # truncates like int()
+        self.rect_y = pos[:, 1].astype(np.int64).tolist()
+        self.angles = self.angle[:n].tolist()
+
+
+class _RowVector:
+    """x/y view of one row of a (n, 2) component array, usable where a sequence or Vector2 attribute is read."""
+
+    __slots__ = ("_store", "_name", "_index")
+
+    def __init__(self, store: ComponentStore, name: str, index: int):
+        self._store = store
+        self._name = name
+        self._index = index
+
+    @property
+    def x(self) -> float:
+        return float(getattr(self._store, self._name)[self._index, 0])
+
+    @x.setter
+    def x(self, value: float):
+        getattr(self._store, self._name)[self._index, 0] = value
+
+    @property
+    def y(self) -> float:
+        return float(getattr(self._store, self._name)[self._index, 1])
+
+    @y.setter
+    def y(self, value: float):
+        getattr(self._store, self._name)[self._index, 1] = value
+
+    def __len__(self) -> int:
+        return 2
+
+    def __getitem__(self, i: int) -> float:
+        return float(getattr(self._store, self._name)[self._index, i])
+
+    def __setitem__(self, i: int, value: float):
+        getattr(self._store, self._name)[self._index, i] = value
+
+    def __iter__(self):
+        return iter((self.x, self.y))
+
+    def __repr__(self) -> str:
+        return f"<{self._name} {self.x}, {self.y}>"
+
+
+def _row_vector(name: str):
+    # property backed by a row of store.<name>; assigning copies x and y in.
+    # Once the row is released, the values saved by release() are used instead
+    def get(self):
+        if self._index is None:
+            return self._released[name]
+        return _RowVector(self._store, name, self._index)
+
+    def set(self, value):
+        if self._index is None:
+            self._released[name].update(value[0], value[1])
+        else:
+            getattr(self._store, name)[self._index] = (value[0], value[1])
+
+    return property(get, set)
+
+
+def _row_scalar(name: str):
+    def get(self):
+        if self._index is None:
+            return self._released[name]
+        return float(getattr(self._store, name)[self._index])
+
+    def set(self, value):
+        if self._index is None:
+            self._released[name] = float(value)
+        else:
+            getattr(self._store, name)[self._index] = value
+
+    return property(get, set)
+
+
+class BulkEntity(Entity):
+    """
+    Entity whose motion lives in a ComponentStore. update() only syncs rect and
+    image from the store, the store's own update() does the integration, so
+    position changes made between the two show up in the rect a frame later.
+    remove(), kill() and release() give the row back to the store; after that
+    the entity no longer moves and keeps its last motion values as plain attributes.
+    """
+
+    pos = _row_vector("pos")
+    vel = _row_vector("vel")
+    acc = _row_vector("acc")
+    angle = _row_scalar("angle")
+    angular_velocity = _row_scalar("angular_velocity")
+
+    def __init__(
+        self,
+        store: ComponentStore,
+        pos=(0, 0),
+        image: pygame.Surface | None = None,
+        size=(32, 32),
+        group: pygame.sprite.AbstractGroup = None
+    ):
+        self._store = store
+        self._index = store.add(pos)
+        super().__init__(pos, image, size, group)
+
+    def update(self, dt: float):
+        store = self._store
+        index = self._index
+        if index is None or index >= len(store.angles):
+            return  # released, or added after the store's last update
+        angle = store.angles[index]
+        if angle:
+            self.image = get_rotated(self._orig_image, -angle)
+            self.rect = pygame.Rect((0, 0), logical_size(self.image))
+            self.rect.center = self.pos
+        else:
+            self.image = self._orig_image
+            self.rect.x = store.rect_x[index]
+            self.rect.y = store.rect_y[index]
+
+    def remove(self):
+        self.release()
+        super().remove()
+
+    def kill(self):
+        self.release()
+        super().kill()
+
+    def release(self):
+        """Give the row back to the store, keeping the current motion values."""
+        if self._index is not None:
+            self._released = {
+                "pos": pygame.math.Vector2(self.pos.x, self.pos.y),
+                "vel": pygame.math.Vector2(self.vel.x, self.vel.y),
+                "acc": pygame.math.Vector2(self.acc.x, self.acc.y),
+                "angle": self.angle,
+                "angular_velocity": self.angular_velocity,
+            }
+            self._store.remove(self._index)
+            self._index = None
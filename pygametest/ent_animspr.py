@@ -1,11 +1,36 @@
-from .entity import Entity
+from .entity import Entity, LIVE_ENTITIES
 import pygame
-from .resload import get_resource
+from .resload import pin_resource, unpin_resource, blit_flags, is_loaded, preload_resources, get_trim, logical_size, to_screen
+from .resload import get_atlas_table, atlas_frame, add_reload_listener
+from .fonts import get_font
+from .mirrors import get_mirrored, prebuild_mirrored
 import sys
+import time
 
 DEBUG_ANIMSPR = '--debug' in sys.argv or '--debug-animspr' in sys.argv
 
+
+def _swap_reloaded_frames(key, old, new):
+    # frames replaced by a hot reload (changed size or format); in-place updates need nothing
+    if old is None:
+        return
+    for ent in list(LIVE_ENTITIES):
+        if isinstance(ent, AnimatedSprite):
+            for anim in ent.animations.values():
+                frames = anim["frames"]
+                for i, frame in enumerate(frames):
+                    if frame is old:
+                        frames[i] = new
+
+
+add_reload_listener(_swap_reloaded_frames)
+
 class AnimatedSprite(Entity):
+
+    # streamed animations: frames adopted from the background loader, and
+    # stalls where a needed frame was still missing and had to be waited for
+    stream_stats = {"adopted": 0, "stalls": 0, "stall_ms": 0.0}
+
     def __init__(self, pos, animations, **kwargs):
         super().__init__(pos)
         self.animations = animations
@@ -20,11 +45,12 @@ class AnimatedSprite(Entity):
         self.loops = -1
 
         if DEBUG_ANIMSPR:
-            self.font = pygame.font.Font(None, 24)
+            self.font = get_font(None, 24)
 
         if "initial" in kwargs:
             self.play_animation(kwargs["initial"])
-            self.size = self.animations[self.current_animation]["frames"][0].get_size()
+            # untrimmed size, frames may have had their transparent border trimmed
+            self.size = get_trim(self.get_frame(self.current_animation, 0))[2:]
 
     @staticmethod
     def cut_spritesheet(sheet, sprite_width, sprite_height, max_count:int = -1):
@@ -41,18 +67,85 @@ class AnimatedSprite(Entity):
         return sprites
 
     @staticmethod
-    def anim_from_path_template(path_template:str, frame_count:int, from_index=1, frame_time:float = 1.0/12.0):
-        """Create an animation from a path template."""
+    def anim_from_path_template(path_template:str, frame_count:int, from_index=1, frame_time:float = 1.0/12.0,
+                                stream:bool = False, resident:int = 1):
+        """
+        Create an animation from a path template.
+        Frames are pinned in the resource cache until release() is called on the sprite.
+        With stream, only the first `resident` frames (and any already loaded) are
+        required now; the rest are left as None and decoded in the background.
+        """
         frames = []
-        for i in range(from_index, from_index + frame_count):
+        keys = []
+        queued = []
+        for n, i in enumerate(range(from_index, from_index + frame_count)):
             frame_path = path_template.format(i)
-            frame = get_resource(frame_path)
-            frames.append(frame)
+            keys.append(frame_path)
+            if not stream or n < resident or is_loaded(frame_path):
+                frames.append(pin_resource(frame_path))
+            else:
+                frames.append(None)
+                queued.append(frame_path)
+        if queued:
+            preload_resources(queued)
         return {
                 "frames": frames,
-                "frame_time": frame_time
+                "frame_time": frame_time,
+                "keys": keys
             }
 
+    @staticmethod
+    def anim_from_atlas(atlas_key:str, name:str, frame_time:float = 1.0/12.0):
+        """
+        Create an animation from an atlas frame table (see resize_assets.py --atlas).
+        Frames are subsurfaces of the atlas pages; each frame pins its page, so
+        the same release() applies as for anim_from_path_template.
+        """
+        table = get_atlas_table(atlas_key)
+        base = atlas_key.rpartition("/")[0]
+        frames = []
+        keys = []
+        for entry in table["animations"][name]:
+            page_key = f"{base}/{table['pages'][entry['page']]}" if base else table["pages"][entry["page"]]
+            frames.append(atlas_frame(pin_resource(page_key), entry))
+            keys.append(page_key)
+        return {
+                "frames": frames,
+                "frame_time": frame_time,
+                "keys": keys
+            }
+
+    def release(self):
+        """Unpin the cached frames of all animations so the cache may evict them."""
+        for anim in self.animations.values():
+            for key, frame in zip(anim.get("keys", ()), anim["frames"]):
+                if frame is not None:
+                    unpin_resource(key)
+            anim["keys"] = []
+
+    def prebuild_mirrors(self, flip_x=True, flip_y=False, background=True):
+        """Build the mirrored frames of all loaded animation frames ahead of draw (see mirrors.py)."""
+        for anim in self.animations.values():
+            prebuild_mirrored(anim["frames"], flip_x, flip_y, background)
+
+    def get_frame(self, name, index):
+        """Return a frame, adopting it from the stream (and waiting if still missing) if needed."""
+        anim = self.animations[name]
+        frame = anim["frames"][index]
+        if frame is None:
+            key = anim["keys"][index]
+            stats = AnimatedSprite.stream_stats
+            if is_loaded(key):
+                frame = pin_resource(key)
+            else:
+                start = time.perf_counter()
+                frame = pin_resource(key)
+                stats["stalls"] += 1
+                stats["stall_ms"] += (time.perf_counter() - start) * 1000.0
+            stats["adopted"] += 1
+            anim["frames"][index] = frame
+        return frame
+
     def play_animation(self, name, loops = -1):
         if self.current_animation != name:
             self.current_animation = name
@@ -60,6 +153,8 @@ class AnimatedSprite(Entity):
             self.anim_frame_timer = 0.0
             self.looped_times = 0
             self.loops = loops
+            # make sure the first frame is there before it has to be drawn
+            self.get_frame(name, 0)
 
     def update(self, dt):
         if self.current_animation:
@@ -77,11 +172,21 @@ class AnimatedSprite(Entity):
 
     def draw(self, surface, cam_pos):
         if self.current_animation:
-            cam_offset = self.calc_cam_offset(cam_pos)
-            frame = self.animations[self.current_animation]["frames"][self.frame_index]
+            off_x, off_y = self.calc_cam_offset(cam_pos)
+            frame = self.get_frame(self.current_animation, self.frame_index)
+            flags = blit_flags(frame)
+            trim_x, trim_y, src_w, src_h = get_trim(frame)
             if self.flip_x or self.flip_y:
-                frame = pygame.transform.flip(frame, self.flip_x, self.flip_y)
-            surface.blit(frame, self.rect.topleft + self.offset + cam_offset)
+                # mirror the trimmed rect inside the source canvas
+                frame_w, frame_h = logical_size(frame)
+                if self.flip_x:
+                    trim_x = src_w - trim_x - frame_w
+                if self.flip_y:
+                    trim_y = src_h - trim_y - frame_h
+                frame = get_mirrored(frame, self.flip_x, self.flip_y)  # shared, built once per frame
+            rect = self.rect
+            offset = self.offset
+            surface.blit(frame, to_screen(rect.x + offset.x + off_x + trim_x, rect.y + offset.y + off_y + trim_y), special_flags=flags)
             if DEBUG_ANIMSPR:
                 text = f"Anim: {self.current_animation}, Frame: {self.frame_index}"
                 # Render the debug text (you'll need a font and surface for this)
@@ -89,4 +194,4 @@ class AnimatedSprite(Entity):
                 debug_surface.fill((0, 0, 0))
                 text_surface = self.font.render(text, True, (255, 255, 255))
                 debug_surface.blit(text_surface, (5, 5))
-                surface.blit(debug_surface, self.rect.topleft + cam_offset)
+                surface.blit(debug_surface, to_screen(self.rect.x + off_x, self.rect.y + off_y))
@@ -1,6 +1,7 @@
 from typing import Tuple
 from .entity import Entity
 import pygame
+from .resload import screen_rect
 
 class Bar(Entity):
 
@@ -21,9 +22,10 @@ class Bar(Entity):
         self.max_value = max_value
         self.current_value = current_value
         self.rect = pygame.Rect(pos, size)
-        self.image = pygame.Surface(self.rect.size)
+        self.image = self._orig_image = pygame.Surface(screen_rect(self.rect).size, pygame.SRCALPHA)
         self.scroll = False
         self.ltr = ltr
+        self._fill_width = None
 
     def set_value(self, value: float):
         """Set the current value of the bar."""
@@ -33,9 +35,14 @@ class Bar(Entity):
         """Update the bar's visual representation."""
         super().update(dt)
         fill_ratio = self.current_value / self.max_value if self.max_value > 0 else 0
-        fill_width = int(self.rect.width * fill_ratio)
+        width, height = self.image.get_size()
+        fill_width = int(width * fill_ratio)
+        if fill_width == self._fill_width:
+            return
+        self._fill_width = fill_width
 
-        # Create a new surface for the bar
+        # Create a new surface for the bar (a new object, so dirty-rect rendering sees the change)
+        self.image = self._orig_image = pygame.Surface((width, height), pygame.SRCALPHA)
         self.image.fill(self.bg_color)
         if fill_width > 0:
-            pygame.draw.rect(self.image, self.color, (self.rect.width - fill_width, 0, fill_width, self.rect.height) if self.ltr else (0, 0, fill_width, self.rect.height))
\ No newline at end of file
+            pygame.draw.rect(self.image, self.color, (width - fill_width, 0, fill_width, height) if self.ltr else (0, 0, fill_width, height))
\ No newline at end of file
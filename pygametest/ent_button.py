@@ -1,6 +1,8 @@
 from typing import Callable, Optional, Tuple
 import pygame
 from .entity import Entity
+from .resload import blit_flags, logical_size, from_screen, screen_rect
+from .fonts import get_font
 
 # ent_button.py
 
@@ -14,6 +16,8 @@ class Button(Entity):
     - callback: function(button: Button) called on click
     """
 
+    EVENT_TYPES = (pygame.MOUSEMOTION, pygame.MOUSEBUTTONDOWN, pygame.MOUSEBUTTONUP)
+
     def __init__(
         self,
         x: int,
@@ -37,12 +41,11 @@ class Button(Entity):
 
         self.rect = pygame.Rect(x, y, 200, 50)
         if self.image:
-            self.rect = pygame.Rect(x, y, self.image.get_width(), self.image.get_height())
+            self.rect = pygame.Rect((x, y), logical_size(self.image))
         self.text = text
         self.callback = callback
 
-        pygame.font.init()
-        self.font = font or pygame.font.SysFont(None, 20)
+        self.font = font or get_font(None, 20)
 
         self.enabled = enabled
         self.visible = visible
@@ -51,6 +54,8 @@ class Button(Entity):
         self.hover = False
         self.pressed = False
         self._mouse_down_inside = False
+        self._text_surf = None  # rendered label, redone when text changes
+        self._text_key = None
 
     def update(self, dt: float = 0):
         pass
@@ -63,15 +68,15 @@ class Button(Entity):
         if not self.visible or not self.enabled:
             # still track hover for visual consistency on motion if visible
             if event.type == pygame.MOUSEMOTION and self.visible:
-                self.hover = self.rect.collidepoint(event.pos)
+                self.hover = self.rect.collidepoint(from_screen(event.pos))
             return False
 
         if event.type == pygame.MOUSEMOTION:
-            self.hover = self.rect.collidepoint(event.pos)
+            self.hover = self.rect.collidepoint(from_screen(event.pos))
             return False
 
         if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
-            if self.rect.collidepoint(event.pos):
+            if self.rect.collidepoint(from_screen(event.pos)):
                 self.pressed = True
                 self._mouse_down_inside = True
                 return True
@@ -80,7 +85,7 @@ class Button(Entity):
             if self.pressed:
                 self.pressed = False
                 consumed = False
-                if self._mouse_down_inside and self.rect.collidepoint(event.pos):
+                if self._mouse_down_inside and self.rect.collidepoint(from_screen(event.pos)):
                     consumed = True
                     if self.callback:
                         self.callback()
@@ -96,12 +101,16 @@ class Button(Entity):
         if not self.visible:
             return
 
+        rect = screen_rect(self.rect)
         if self.image:
-            surface.blit(self.image, self.rect)
+            surface.blit(self.image, rect, special_flags=blit_flags(self.image))
 
         if self.text:
-            text_surf = self.font.render(self.text, True, (10, 10, 10))
-            text_rect = text_surf.get_rect(center=self.rect.center)
+            if self._text_key != (self.text, self.font):
+                self._text_key = (self.text, self.font)
+                self._text_surf = self.font.render(self.text, True, (10, 10, 10))
+            text_surf = self._text_surf
+            text_rect = text_surf.get_rect(center=rect.center)
             surface.blit(text_surf, text_rect)
 
     # convenience setters/getters
@@ -1,7 +1,7 @@
 import math
 from .entity import Entity
 from .ent_animspr import AnimatedSprite
-from .resload import get_resource
+from .resload import get_resource, get_trim, screen_rect, has_resource
 
 import pygame
 import sys
@@ -9,6 +9,9 @@ import sys
 # REMEMBER, ROBOT! CHARACTERS DONT JUMP IN THIS GAME!!!
 
 DBG_COLL = '--debug' in sys.argv or '--debug-coll' in sys.argv
+PREBUILD_MIRRORS = '--prebuild-mirrors' in sys.argv  # mirror every frame up front instead of on first draw
+# only the first frame of each animation is needed up front, the rest streams in
+STREAM_ANIMS = '--no-stream-anims' not in sys.argv
 
 CHAR_CONFIG = {
     0: {
@@ -62,6 +65,7 @@ class LittleGuy(AnimatedSprite):
     DIM_Y = 600
     MIN_X = -260
     MAX_X = 1920 - MIN_X - DIM_X
+    EVENT_TYPES = (pygame.KEYDOWN, pygame.KEYUP)
 
     """
     Simple fighting-game actor with a small state machine.
@@ -90,6 +94,9 @@ class LittleGuy(AnimatedSprite):
         self.p2 = p2  # whether we are player 2 (for controls)
         self.input_map = self.INPUT_MAP[1] if p2 else self.INPUT_MAP[0]
         self.input_states = {key: False for key in self.input_map.keys()}
+        self.event_keys = tuple(self.input_map.values())  # only our own keys are routed to handle_event
+        if PREBUILD_MIRRORS:
+            self.prebuild_mirrors()  # either fighter may end up facing left
 
         # restoration state
         self.start_pos = pos
@@ -119,35 +126,48 @@ class LittleGuy(AnimatedSprite):
     def calc_offset_center(self):
         """Calculate offset to center the sprite in the rect."""
         anim_frame = self.animations[self.STATE_IDLE]["frames"][0]
-        frame_w, frame_h = anim_frame.get_size()
+        frame_w, frame_h = get_trim(anim_frame)[2:]
         offset_x = (self.size.width - frame_w) // 2
         offset_y = (self.size.height - frame_h) // 2
         return pygame.math.Vector2(offset_x, offset_y)
 
     @classmethod
     def _make_anims(cls, char_id: int):
+        # state -> (animation directory, frame count, first file index)
         if char_id == 0:
-            animations = {
-                cls.STATE_IDLE: AnimatedSprite.anim_from_path_template(f"chr/{char_id}/idle/{{:04d}}.png", 23),
-                cls.STATE_WALK: AnimatedSprite.anim_from_path_template(f"chr/{char_id}/walk/{{:04d}}.png", 23),
-                cls.STATE_PUNCH: AnimatedSprite.anim_from_path_template(f"chr/{char_id}/punch/{{:04d}}.png", 30),
-                cls.STATE_KICK: AnimatedSprite.anim_from_path_template(f"chr/{char_id}/kick/{{:04d}}.png", 25),
-                cls.STATE_BLOCK: AnimatedSprite.anim_from_path_template(f"chr/{char_id}/block/{{:04d}}.png", 13, 0),
-                cls.STATE_HIT: AnimatedSprite.anim_from_path_template(f"chr/{char_id}/hit/{{:04d}}.png", 18, 0),
-                cls.STATE_DEAD: AnimatedSprite.anim_from_path_template(f"chr/{char_id}/death/{{:04d}}.png", 36, 0),
+            sources = {
+                cls.STATE_IDLE: ("idle", 23, 1),
+                cls.STATE_WALK: ("walk", 23, 1),
+                cls.STATE_PUNCH: ("punch", 30, 1),
+                cls.STATE_KICK: ("kick", 25, 1),
+                cls.STATE_BLOCK: ("block", 13, 0),
+                cls.STATE_HIT: ("hit", 18, 0),
+                cls.STATE_DEAD: ("death", 36, 0),
             }
         elif char_id == 1:
-            animations = {
-                cls.STATE_IDLE: AnimatedSprite.anim_from_path_template(f"chr/{char_id}/idle/{{:04d}}.png", 13, 0),
-                cls.STATE_WALK: AnimatedSprite.anim_from_path_template(f"chr/{char_id}/walk/{{:04d}}.png", 18, 0),
-                cls.STATE_PUNCH: AnimatedSprite.anim_from_path_template(f"chr/{char_id}/punch/{{:04d}}.png", 33, 0),
-                cls.STATE_KICK: AnimatedSprite.anim_from_path_template(f"chr/{char_id}/kick/{{:04d}}.png", 24, 0),
-                cls.STATE_BLOCK: AnimatedSprite.anim_from_path_template(f"chr/{char_id}/hit/{{:04d}}.png", 13, 0), # FIXME
-                cls.STATE_HIT: AnimatedSprite.anim_from_path_template(f"chr/{char_id}/hit/{{:04d}}.png", 13, 0),
-                cls.STATE_DEAD: AnimatedSprite.anim_from_path_template(f"chr/{char_id}/death/{{:04d}}.png", 36, 0),
+            sources = {
+                cls.STATE_IDLE: ("idle", 13, 0),
+                cls.STATE_WALK: ("walk", 18, 0),
+                cls.STATE_PUNCH: ("punch", 33, 0),
+                cls.STATE_KICK: ("kick", 24, 0),
+                cls.STATE_BLOCK: ("hit", 13, 0), # FIXME
+                cls.STATE_HIT: ("hit", 13, 0),
+                cls.STATE_DEAD: ("death", 36, 0),
             }
         else:
             raise ValueError(f"Unknown character id: {char_id}")
+
+        # packed by resize_assets.py --atlas: whole atlas pages instead of one file per frame
+        atlas_key = f"chr/{char_id}/atlas.json"
+        if has_resource(atlas_key):
+            return {
+                state: AnimatedSprite.anim_from_atlas(atlas_key, name)
+                for state, (name, _count, _first) in sources.items()
+            }
+        animations = {
+            state: AnimatedSprite.anim_from_path_template(f"chr/{char_id}/{name}/{{:04d}}.png", count, first, stream=STREAM_ANIMS)
+            for state, (name, count, first) in sources.items()
+        }
         return animations
 
 
@@ -202,6 +222,12 @@ class LittleGuy(AnimatedSprite):
         # apply knockback and hit state
         self.knockback_x -= knockback*self.facing
 
+    def on_collision(self, other):
+        # our attack hitbox reached other's rect (see SceneGameplay.collisions)
+        receive_hit = getattr(other, "receive_hit", None)
+        if receive_hit is not None:
+            receive_hit(self.hit_damage, 50)
+
     def update(self, dt):
         """Update physics and state machine. dt is seconds elapsed."""
 
@@ -317,9 +343,9 @@ class LittleGuy(AnimatedSprite):
         super().draw(surface, cam_pos)
         cam_offset = self.calc_cam_offset(cam_pos)
         if DBG_COLL:
-            pygame.draw.rect(surface, pygame.Color("red" if not self.blocking else "blue"), self.rect.move(cam_offset), 2)
+            pygame.draw.rect(surface, pygame.Color("red" if not self.blocking else "blue"), screen_rect(self.rect.move(cam_offset)), 2)
             if self.hitbox:
-                pygame.draw.rect(surface, pygame.Color("green"), self.hitbox.move(cam_offset), 2)
+                pygame.draw.rect(surface, pygame.Color("green"), screen_rect(self.hitbox.move(cam_offset)), 2)
 
     def reset(self):
         self.change_state(self.STATE_IDLE)
@@ -0,0 +1,82 @@
+import weakref
+import pygame
+from .entity import Entity
+from .resload import add_reload_listener
+from .scene_base import surface_redrawn
+
+# every live background, so hot-reloaded layer images drop stale composites
+_LIVE_BACKGROUNDS = weakref.WeakSet()
+
+
+def _drop_composites(key, old, new):
+    for bg in list(_LIVE_BACKGROUNDS):
+        bg.clear()
+
+
+add_reload_listener(_drop_composites)
+
+
+class ParallaxBackground(Entity):
+    """
+    Opaque, screen-sized composite of parallax layer entities.
+
+    The layers are blended into one persistent buffer filled with bg_color,
+    which is then blitted in one go. The buffer is only redrawn when the whole-
+    pixel camera position or the image of a layer (the crowd cycling its frames)
+    changed since it was last drawn, so a still camera costs one opaque blit.
+    A moving camera costs the layer blits plus that one.
+
+    The layers always go to the same buffer, never straight to the screen: SDL
+    keeps an RLE image encoded for the last Surface it was blitted to and
+    re-encodes it when the target changes, which for these 2400 px wide layers
+    costs far more than the blit itself.
+    The layers stay regular entities: keep updating them and swapping their images.
+    """
+
+    def __init__(self, layers: list, bg_color: pygame.Color):
+        super().__init__()
+        self.layers = layers
+        self.bg_color = bg_color
+        self._buffer = None
+        self._key = None  # (cam x, cam y, layer images...) the buffer shows
+        self.stats = {"hits": 0, "misses": 0}
+        _LIVE_BACKGROUNDS.add(self)
+
+    def update(self, dt: float):
+        for layer in self.layers:
+            layer.update(dt)
+
+    def composite(self, size, cam_pos: pygame.math.Vector2) -> pygame.Surface:
+        """Return the buffer drawn for this camera position and the current layer images."""
+        cam_x = round(cam_pos.x)
+        cam_y = round(cam_pos.y)
+        key = (cam_x, cam_y, *(layer.image for layer in self.layers))
+        buffer = self._buffer
+        if buffer is not None and key == self._key and buffer.get_size() == size:
+            self.stats["hits"] += 1
+            return buffer
+
+        self.stats["misses"] += 1
+        if buffer is None or buffer.get_size() != size:
+            buffer = pygame.Surface(size)
+            if pygame.display.get_surface() is not None:
+                buffer = buffer.convert()
+            self._buffer = buffer
+        buffer.fill(self.bg_color)
+        cam = pygame.math.Vector2(cam_x, cam_y)
+        for layer in self.layers:
+            layer.draw(buffer, cam)
+        self._key = key
+        surface_redrawn(buffer)  # same Surface, new content (dirty-rect rendering)
+        return buffer
+
+    def draw(self, surface: pygame.Surface, cam_pos: pygame.math.Vector2):
+        surface.blit(self.composite(surface.get_size(), cam_pos), (0, 0))
+
+    def clear(self):
+        """Drop the buffer (it is redrawn on the next draw)."""
+        self._buffer = None
+        self._key = None
+
+    def release(self):
+        self.clear()
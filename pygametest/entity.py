@@ -1,8 +1,30 @@
 import pygame
+import weakref
 from typing import Optional, Tuple
+from .resload import is_optimized, blit_flags, logical_size, to_screen, add_reload_listener
+from .rotations import get_rotated
 
 pygame.init()
 
+_NO_OFFSET = (0.0, 0.0)  # camera offset of entities that do not scroll
+
+# every live entity, so hot-reloaded images can be swapped in (see resload.reload_resource)
+LIVE_ENTITIES = weakref.WeakSet()
+
+
+def _swap_reloaded_image(key, old, new):
+    if old is None or not isinstance(new, pygame.Surface):
+        return
+    for ent in list(LIVE_ENTITIES):
+        if getattr(ent, "_orig_image", None) is old:
+            ent._orig_image = new
+            ent.image = new
+            ent.rect.size = logical_size(new)
+            ent.blend_flags = blit_flags(new)
+
+
+add_reload_listener(_swap_reloaded_image)
+
 
 class Entity(pygame.sprite.Sprite):
     """
@@ -10,8 +32,14 @@ class Entity(pygame.sprite.Sprite):
     - Uses pygame.sprite.Sprite so it integrates with Groups.
     - Keeps float position/velocity using Vector2.
     - update(dt) expects dt in seconds.
+    - The per-frame path (update, calc_cam_offset, draw) does not allocate Vector2s.
+      There are no __slots__: Sprite has none, so instances keep a __dict__ anyway.
+    - Subclasses overriding handle_event get the event types in EVENT_TYPES
+      (None = all) from their scene, and only the keys in `event_keys` if set.
     """
 
+    EVENT_TYPES = None
+
     def __init__(
         self,
         pos: Tuple[float, float] = (0, 0),
@@ -31,21 +59,38 @@ class Entity(pygame.sprite.Sprite):
 
         # image and rect required by pygame.sprite.Sprite
         if image is not None:
-            self._orig_image = image.convert_alpha()
+            # resources may already be in display format (opaque ones without alpha)
+            self._orig_image = image if is_optimized(image) else image.convert_alpha()
+            size = logical_size(image)  # rect is in logical pixels, image is at the resource tier
         else:
             self._orig_image = pygame.Surface(size, pygame.SRCALPHA)
         self.image = self._orig_image.copy()
-        self.rect = self.image.get_rect(topleft=self.pos)
+        self.rect = pygame.Rect(self.pos, size)
+        self.blend_flags = blit_flags(self._orig_image)  # special_flags for draw
 
         self.alive_flag = True
+        self._cam_x = self._cam_y = self._cam_parallax = None  # calc_cam_offset cache
+        self._cam_off = (0.0, 0.0)
+        LIVE_ENTITIES.add(self)
 
         if group is not None:
             group.add(self)
 
-    def calc_cam_offset(self, cam_pos: pygame.math.Vector2) -> pygame.math.Vector2:
-        """Calculate the camera offset for this entity."""
-        m_cam_pos = -cam_pos
-        return pygame.math.Vector2(m_cam_pos.x * self.parallax, m_cam_pos.y * self.parallax) if self.scroll else pygame.math.Vector2(0, 0)
+    def calc_cam_offset(self, cam_pos: pygame.math.Vector2) -> Tuple[float, float]:
+        """
+        Calculate the camera offset (x, y) for this entity. The result is cached
+        until the camera or the parallax factor changes.
+        """
+        if not self.scroll:
+            return _NO_OFFSET
+        x = cam_pos.x
+        y = cam_pos.y
+        if x != self._cam_x or y != self._cam_y or self.parallax != self._cam_parallax:
+            self._cam_x = x
+            self._cam_y = y
+            self._cam_parallax = self.parallax
+            self._cam_off = (-x * self.parallax, -y * self.parallax)
+        return self._cam_off
 
     def handle_event(self, event: pygame.event.Event):
         pass
@@ -55,24 +100,34 @@ class Entity(pygame.sprite.Sprite):
         Update physics and transform.
         dt: time delta in seconds.
         """
-        # basic Euler integration
-        self.vel += self.acc * dt
-        self.pos += self.vel * dt
-
-        # rotation (keep original image and rotate from it)
-        self.angle = (self.angle + self.angular_velocity * dt) % 360
+        # basic Euler integration, per component so no temporary vectors are created
+        vel = self.vel
+        acc = self.acc
+        if acc.x or acc.y:
+            vel.x += acc.x * dt
+            vel.y += acc.y * dt
+        if vel.x or vel.y:
+            self.pos.x += vel.x * dt
+            self.pos.y += vel.y * dt
+
+        # rotation (keep original image and rotate from it, shared and quantized, see rotations.py)
+        if self.angular_velocity:
+            self.angle = (self.angle + self.angular_velocity * dt) % 360
         if self.angle:
-            self.image = pygame.transform.rotate(self._orig_image, -self.angle)
+            self.image = get_rotated(self._orig_image, -self.angle)
             # keep sprite centered at self.pos when rotated
-            self.rect = self.image.get_rect(center=self.pos)
+            self.rect = pygame.Rect((0, 0), logical_size(self.image))
+            self.rect.center = self.pos
         else:
             self.image = self._orig_image
-            self.rect.topleft = (int(self.pos.x), int(self.pos.y))
+            self.rect.x = int(self.pos.x)
+            self.rect.y = int(self.pos.y)
 
     def draw(self, surface: pygame.Surface, cam_pos: pygame.math.Vector2):
         """Blit the entity to the given surface."""
-        cam_off = self.calc_cam_offset(cam_pos)
-        surface.blit(self.image, self.rect.move(cam_off.x, cam_off.y))
+        off_x, off_y = self.calc_cam_offset(cam_pos)
+        rect = self.rect
+        surface.blit(self.image, to_screen(rect.x + off_x, rect.y + off_y), special_flags=self.blend_flags)
 
     # convenience helpers
     def apply_impulse(self, impulse: Tuple[float, float]):
@@ -0,0 +1,78 @@
+from typing import Optional
+import io
+import pygame
+from . import resload
+
+"""
+pygametest.fonts - shared font registry.
+
+Provides:
+- get_font(name=None, size=20, bold=False, italic=False)
+- clear()
+
+`name` is either a resload key of a .ttf/.otf file under res/ (e.g. "fonts/title.ttf"),
+a system font family (e.g. "Arial", resolved once through pygame.font.SysFont), or
+None for pygame's default font. Sizes are logical and scaled by the resolution tier
+(see resload.set_tier_scale). Font objects are cached per (name, size, bold, italic),
+and resource font files are read once and kept in memory so any size can be
+created without going back to disk.
+"""
+
+
+# internal state
+_fonts: dict[tuple, pygame.font.Font] = {}
+_font_bytes: dict[str, bytes] = {}
+
+
+def _ensure_font():
+    if not pygame.font.get_init():
+        pygame.font.init()
+
+
+def _resource_font_bytes(name: str) -> Optional[bytes]:
+    if name in _font_bytes:
+        return _font_bytes[name]
+    data = resload.get_resource_bytes(name)
+    if data is not None:
+        _font_bytes[name] = data
+    return data
+
+
+def get_font(name: Optional[str] = None, size: int = 20, bold: bool = False, italic: bool = False) -> pygame.font.Font:
+    """
+    Return a shared Font. Callers must not change its style (set_bold etc.);
+    ask for a different bold/italic combination instead.
+    """
+    key = (name, size, bold, italic)
+    font = _fonts.get(key)
+    if font is not None:
+        return font
+
+    _ensure_font()
+    size = max(1, round(size * resload.tier_scale()))
+    data = _resource_font_bytes(name) if name is not None else None
+    if data is not None:
+        # pygame reads the font lazily from the file object, so each Font gets its own
+        font = pygame.font.Font(io.BytesIO(data), size)
+        font.bold = bold
+        font.italic = italic
+    else:
+        font = pygame.font.SysFont(name, size, bold, italic)
+
+    _fonts[key] = font
+    return font
+
+
+def _on_reload(key, _old, _new):
+    # a resource font file changed on disk, rebuild fonts from the new bytes
+    if key in _font_bytes:
+        clear()
+
+
+resload.add_reload_listener(_on_reload)
+
+
+def clear():
+    """Drop all cached fonts, e.g. after the resources were reloaded."""
+    _fonts.clear()
+    _font_bytes.clear()
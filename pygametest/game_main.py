@@ -1,13 +1,23 @@
 
+import os
 import sys
 import pygame
 
 from pygametest.scene_title import SceneTitle
 from pygametest.scene_victory import SceneVictory
 
-from .resload import load_resources_init, load_resource
+from .resload import load_resources_init, load_resource, load_resources_parallel, set_cache_budget
+from .resload import open_bundle, load_bundled_resource, set_surface_optimizer, set_trim_patterns
+from .resload import set_dedup, dedup_report, set_stream_patterns
+from .resload import pin_resource, unpin_resource, resolve_manifest
+from .resload import preload_resources, pump_preloaded, unload_resources, release_preloaded
+from .resload import set_preload_threads, load_resources_async, set_tier_scale
+from .resload import watch_resources, poll_resource_changes
 
 from .scene_gameplay import SceneGameplay
+from .fonts import get_font
+from .rotations import set_rotation_cache
+from .mirrors import pump_mirrors, set_mirror_threads, clear as clear_mirrors
 
 
 WIDTH, HEIGHT = 1920, 1080
@@ -15,24 +25,112 @@ TITLE = "Poca Lucha"
 RES_DIR = "./res/"
 FULLSCREEN = (sys.argv.count("--fullscreen") + sys.argv.count("-f")> 0)
 SHOW_FPS = "--debug" in sys.argv or "--fps" in sys.argv
+PRELOAD = "--preload" in sys.argv  # decode everything at boot instead of on first use
+
+
+def arg_value(name: str, default=None):
+    """Return the value following `name` on the command line, or default."""
+    if name in sys.argv:
+        idx = sys.argv.index(name)
+        if idx + 1 < len(sys.argv):
+            return sys.argv[idx + 1]
+    return default
+
+
+# resource cache budget in megabytes of decoded data (0 = unbounded)
+RES_BUDGET_MB = int(arg_value("--res-budget", 512))
+# worker pool used by --preload to decode images (1 = load serially on the main thread)
+LOAD_WORKERS = int(arg_value("--load-workers", os.cpu_count() or 1))
+LOAD_PROCESSES = "--load-processes" in sys.argv  # decode in processes instead of threads
+RES_BUNDLE = arg_value("--bundle")  # packed resource bundle to use instead of RES_DIR
+OPTIMIZE_SURFACES = "--no-optimize" not in sys.argv  # convert loaded images to display format
+PREMULTIPLY = "--premultiply" in sys.argv  # premultiply alpha, blit with BLEND_PREMULTIPLIED
+TRIM_PATTERNS = () if "--no-trim" in sys.argv else ("chr/*/*/*.png",)  # crop transparent borders of these
+DEDUP = "--no-dedup" not in sys.argv  # share one Surface between identical images
+# background music is streamed by pygame.mixer.music instead of decoded into Sounds
+STREAM_PATTERNS = () if "--no-stream-bgm" in sys.argv else ("bgm/*", "bgm.ogg")
+# rotated images are cached per ROTATION_STEP degrees, up to ROTATION_CACHE_MB of pixels
+ROTATION_STEP = float(arg_value("--rotation-step", 1.0))
+ROTATION_CACHE_MB = 32
+DIRTY_RECTS = "--dirty-rects" in sys.argv  # only redraw and update the changed parts of the screen
+WATCH = "--watch" in sys.argv  # hot reload resource files changed on disk (development)
+# high-rate input events, kept out of the queue while no entity of the scene subscribes to them
+MOTION_EVENTS = (
+    pygame.MOUSEMOTION, pygame.FINGERMOTION, pygame.JOYAXISMOTION, pygame.JOYBALLMOTION,
+    pygame.JOYHATMOTION, pygame.CONTROLLERAXISMOTION,
+)
+PRELOAD_BUDGET_MS = 4.0  # main-thread time per frame spent storing background-loaded resources
+MIRROR_BUDGET_MS = 2.0  # main-thread time per frame spent on queued mirrored frames (--prebuild-mirrors)
+ASYNC_LOAD_SLICE_MS = 12.0  # run_async: loading time between yields to the browser event loop
+# asset quality tiers: images are loaded at this fraction of their size and the
+# window renders at WIDTH x HEIGHT times the same factor
+TIERS = {"full": 1.0, "half": 0.5, "quarter": 0.25}
+RES_TIER = arg_value("--tier")  # full, half or quarter; picked from the desktop size if not given
+
+
+def select_tier() -> str:
+    """The --tier flag, or the largest tier whose window fits on the desktop."""
+    if RES_TIER in TIERS:
+        return RES_TIER
+    try:
+        desk_w, desk_h = pygame.display.get_desktop_sizes()[0]
+    except Exception:
+        return "full"
+    for name in ("full", "half"):
+        if desk_w >= WIDTH * TIERS[name] and desk_h >= HEIGHT * TIERS[name]:
+            return name
+    return "quarter"
+
+
+def tier_setup() -> float:
+    """Apply the selected tier to resload, using pre-built ./res-<tier>/ images if present."""
+    tier = select_tier()
+    set_tier_scale(TIERS[tier], RES_DIR.rstrip("/") + "-" + tier)
+    return TIERS[tier]
+
+
+def resource_setup() -> list:
+    """
+    Configure resload from the command line and index the resources (keys of
+    the bundle, or file Paths under RES_DIR). Nothing is loaded yet; get_resource
+    loads on first use.
+    """
+    tier_setup()
+    set_cache_budget(RES_BUDGET_MB * 1024 * 1024 if RES_BUDGET_MB > 0 else None)
+    set_surface_optimizer(OPTIMIZE_SURFACES, PREMULTIPLY)
+    set_trim_patterns(TRIM_PATTERNS)
+    set_dedup(DEDUP)
+    set_stream_patterns(STREAM_PATTERNS)
+    if RES_BUNDLE:
+        return open_bundle(RES_BUNDLE)
+    files = load_resources_init(RES_DIR)
+    watch_resources(WATCH)
+    return files
+
 
 class Game:
     def __init__(self, width: int = WIDTH, height: int = HEIGHT):
         pygame.init()
-        self.width = width
+        self.width = width  # logical size, scenes and entities work in these coordinates
         self.height = height
+        scale = tier_setup()
+        set_rotation_cache(ROTATION_STEP, ROTATION_CACHE_MB * 1024 * 1024)
         flags = pygame.SCALED | pygame.RESIZABLE
         if FULLSCREEN:
             flags |= pygame.FULLSCREEN
-        self.screen = pygame.display.set_mode((self.width, self.height), flags, vsync=1)
+        self.screen = pygame.display.set_mode((round(self.width * scale), round(self.height * scale)), flags, vsync=1)
         pygame.display.set_caption(TITLE)
         self.clock = pygame.time.Clock()
         self.running = True
 
-        self.dbg_font = pygame.font.Font(None, 32)
+        self.dbg_font = get_font(None, 32)
         self.bg_color = pygame.Color("black")
 
         self.scene = None
+        self.dirty_rects = []  # screen areas changed this frame (--dirty-rects)
+        self.fps_rect = None
+        self.event_filter_for = (None, None)  # (entities, entities.version) the event filter was set for
+        self.scene_keys = []  # resolved manifest of the current scene, pinned while it runs
         if("-g" in sys.argv):
             self.next_scene = SceneGameplay(self)
         elif("-v" in sys.argv):
@@ -46,57 +144,174 @@ class Game:
         while self.running:
             dt = self.clock.tick() / 1000.0  # delta time in seconds
             if self.next_scene:
-                if self.scene:
-                    self.scene.exit()
-                self.scene = self.next_scene
-                self.scene.enter()
-                self.next_scene = None
+                self.switch_scene()
+            pump_preloaded(PRELOAD_BUDGET_MS)
+            pump_mirrors(MIRROR_BUDGET_MS)
+            if WATCH:
+                self.hot_reload()
             if self.scene:
                 self.scene.update(dt)
-                self.scene.render(self.screen)
+                self.render_scene()
 
             self.handle_events()
             self.update(dt)
             self.draw()
 
+        if SHOW_FPS and DEDUP:
+            for directory, saved in dedup_report():
+                print(f"Dedup saved {saved / 1024:.0f} KiB in {directory}")
+
     async def run_async(self):
         import asyncio
+        await self.resource_load_async()
+
         while self.running:
             dt = self.clock.tick() / 1000.0  # delta time in seconds
             await asyncio.sleep(0)
             if self.next_scene:
-                if self.scene:
-                    self.scene.exit()
-                self.scene = self.next_scene
-                self.scene.enter()
-                self.next_scene = None
+                await self.switch_scene_async()
+            pump_preloaded(PRELOAD_BUDGET_MS)
+            pump_mirrors(MIRROR_BUDGET_MS)
             if self.scene:
                 self.scene.update(dt)
-                self.scene.render(self.screen)
+                self.render_scene()
 
             self.handle_events()
             self.update(dt)
             self.draw()
 
-    def resource_load(self):
+    def switch_scene(self):
+        """
+        Exit the current scene, load the next scene's manifest, then enter it and
+        start preloading the manifests of the scenes likely to follow it.
+        """
+        scene = self.next_scene
+        self.next_scene = None
+        if self.scene:
+            self.scene.exit()
+
+        keys = resolve_manifest(scene.MANIFEST)
+        self.load_keys(keys)
+        self.enter_scene(scene, keys)
+
+    async def switch_scene_async(self):
+        """Like switch_scene, but loads the manifest in slices, yielding to the event loop."""
+        scene = self.next_scene
+        self.next_scene = None
+        if self.scene:
+            self.scene.exit()
+
+        keys = resolve_manifest(scene.MANIFEST)
+        await load_resources_async(keys, ASYNC_LOAD_SLICE_MS, pin=True, progress=self.draw_progress)
+        self.enter_scene(scene, keys)
+
+    def enter_scene(self, scene, keys: list[str]):
+        """Enter a scene whose manifest `keys` are loaded and pinned."""
+        preload_keys = resolve_manifest(scene.PRELOAD)
+        release_preloaded()
+
+        # release what the old scene used and the new one does not need soon
+        for key in self.scene_keys:
+            unpin_resource(key)
+        unload_resources(set(self.scene_keys) - set(keys) - set(preload_keys))
+        self.scene_keys = keys
+
+        self.scene = scene
+        self.scene.enter()
+        preload_resources(preload_keys)
+
+    def load_keys(self, keys: list[str]):
+        """
+        Load and pin resources with a progress bar, waiting on any that are being preloaded.
+        Pinning as we go keeps the cache budget from evicting the first keys of a large manifest.
+        """
+        total = len(keys)
+        last_frame = pygame.time.get_ticks()
+        for done, key in enumerate(keys, 1):
+            pin_resource(key)
+            if pygame.time.get_ticks() - last_frame > 50:
+                last_frame = pygame.time.get_ticks()
+                self.draw_progress(done, total)
+
+    def draw_progress(self, done: int, total: int):
         load_color = pygame.Color("yellow")
         load_bg_color = pygame.Color("#222222")
-        files = load_resources_init(RES_DIR)
+        sw, sh = self.screen.get_size()
+        self.screen.fill(self.bg_color)
+        pygame.draw.rect(self.screen, load_bg_color, pygame.Rect(50, sh // 2 - 15, sw - 100, 30))
+        pygame.draw.rect(self.screen, load_color, pygame.Rect(50, sh // 2 - 15, int((done / total) * (sw - 100)), 30))
+        pygame.display.flip()
+
+    async def resource_load_async(self):
+        """resource_load for run_async: no threads, and --preload loads in event-loop slices."""
+        set_preload_threads(False)
+        set_mirror_threads(False)
+        resource_setup()
+        if PRELOAD:
+            await load_resources_async(resolve_manifest(["*"]), ASYNC_LOAD_SLICE_MS, progress=self.draw_progress)
+
+    def resource_load(self):
+        files = resource_setup()
+        if not PRELOAD:
+            return
+
         total = len(files)
         done = 0
         last_frame = pygame.time.get_ticks()
-        for p in files:
-            load_resource(p, RES_DIR)
+        if RES_BUNDLE:
+            def load_bundled():
+                for key in files:
+                    load_bundled_resource(key)
+                    yield key
+            loaded = load_bundled()
+        elif LOAD_WORKERS > 1:
+            loaded = load_resources_parallel(files, RES_DIR, LOAD_WORKERS, LOAD_PROCESSES)
+        else:
+            def load_serial():
+                for p in files:
+                    load_resource(p, RES_DIR)
+                    yield p
+            loaded = load_serial()
+        for p in loaded:
             done += 1
             print(f"Loaded {done}/{total}: {p}")
             if pygame.time.get_ticks() - last_frame > 50:
                 last_frame = pygame.time.get_ticks()
-                self.screen.fill(self.bg_color)
-                pygame.draw.rect(self.screen, load_bg_color, pygame.Rect(50, self.height // 2 - 15, self.width - 100, 30))
-                pygame.draw.rect(self.screen, load_color, pygame.Rect(50, self.height // 2 - 15, int((done / total) * (self.width - 100)), 30))
-                pygame.display.flip()
+                self.draw_progress(done, total)
+
+    def hot_reload(self):
+        """Reload resource files changed on disk (--watch) and report how long it took."""
+        start = pygame.time.get_ticks()
+        keys = poll_resource_changes()
+        if keys:
+            if self.scene:
+                self.scene.invalidate()  # in-place reloads are invisible to dirty rects
+            clear_mirrors()  # and to the mirrored frames built from them
+            print(f"Reloaded {len(keys)} resource(s) in {pygame.time.get_ticks() - start} ms: {', '.join(keys)}")
+
+    def render_scene(self):
+        if DIRTY_RECTS:
+            self.dirty_rects = self.scene.render_dirty(self.screen)
+        else:
+            self.scene.render(self.screen)
+
+    def update_event_filter(self):
+        """Block the motion events nothing in the scene listens to (scenes themselves only use key events)."""
+        entities = self.scene.entities
+        self.event_filter_for = (entities, entities.version)
+        wanted = entities.subscribed_types()
+        for etype in MOTION_EVENTS:
+            if wanted is None or etype in wanted:
+                pygame.event.set_allowed(etype)
+            else:
+                pygame.event.set_blocked(etype)
 
     def handle_events(self):
+        if self.scene:
+            # versions restart with every registry, so a new scene can be at the one we filtered for
+            entities, version = self.event_filter_for
+            if entities is not self.scene.entities or version != entities.version:
+                self.update_event_filter()
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 self.running = False
@@ -114,6 +329,14 @@ class Game:
             fps_text = self.dbg_font.render(f"FPS: {self.clock.get_fps():.1f}", False, pygame.Color("green"), pygame.Color("black"))
             rect = fps_text.get_rect()
             sw, sh = self.screen.get_size()
-            self.screen.blit(fps_text, (40, sh - rect.height - 40))  # fixed x pos for FPS display
+            if DIRTY_RECTS and self.fps_rect:
+                self.screen.fill(self.bg_color, self.fps_rect)  # the last text may have been wider
+                self.dirty_rects.append(self.fps_rect)
+            self.fps_rect = self.screen.blit(fps_text, (40, sh - rect.height - 40))  # fixed x pos for FPS display
+            self.dirty_rects.append(self.fps_rect)
 
-        pygame.display.flip()
+        if DIRTY_RECTS:
+            pygame.display.update(self.dirty_rects)
+            self.dirty_rects = []
+        else:
+            pygame.display.flip()
@@ -0,0 +1,165 @@
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+import threading
+import time
+import weakref
+import pygame
+from . import resload
+
+"""
+pygametest.mirrors - shared banks of mirrored animation frames.
+
+Provides:
+- get_mirrored(surf, flip_x, flip_y)
+- prebuild_mirrored(frames, flip_x=True, flip_y=False, background=True)
+- pump_mirrors(budget_ms=2.0)
+- set_mirror_threads(enabled)
+- get_stats()
+- clear()
+
+A mirrored copy is built once per source Surface and direction and shared by
+everything that draws that Surface, so sprites facing the other way blit a
+ready-made frame instead of flipping one per draw. The copy keeps the source's
+RLE; trim offsets and blit flags are still those of the source (see
+AnimatedSprite.draw). Entries of a source Surface go away with it.
+
+prebuild_mirrored(background=True) flips plain frames on a worker thread. RLE
+frames are unpacked while being read, which is not safe while the main thread
+blits them, so those (and everything, without threads) are queued for
+pump_mirrors, called once per frame from the main thread.
+"""
+
+
+# internal state
+_cache: "dict[tuple[int, bool, bool], pygame.Surface]" = {}  # (id(src), flip x, flip y) -> mirrored
+_tracked = weakref.WeakSet()  # sources with a finalizer that drops their entries
+_lock = threading.Lock()
+_dead = []  # ids of sources that died, their entries are dropped under _lock by _drop_dead
+_queue = deque()  # (weakref to source, flip x, flip y) waiting for pump_mirrors
+_threads = True
+_pool: ThreadPoolExecutor | None = None
+_stats = {"bytes": 0, "built": 0, "hits": 0}
+
+
+def _is_rle(surf: pygame.Surface) -> bool:
+    return bool(surf.get_flags() & (pygame.RLEACCEL | pygame.RLEACCELOK))
+
+
+def get_mirrored(surf: pygame.Surface, flip_x: bool, flip_y: bool = False) -> pygame.Surface:
+    """Return surf flipped like pygame.transform.flip, building and caching it on first use."""
+    if not (flip_x or flip_y):
+        return surf
+    if _dead:
+        with _lock:
+            _drop_dead()  # before a new Surface can hit the entries of a dead one with the same id
+    mirrored = _cache.get((id(surf), bool(flip_x), bool(flip_y)))
+    if mirrored is not None:
+        _stats["hits"] += 1
+        return mirrored
+    return _build(surf, bool(flip_x), bool(flip_y))
+
+
+def _build(surf: pygame.Surface, flip_x: bool, flip_y: bool) -> pygame.Surface:
+    key = (id(surf), flip_x, flip_y)
+    with _lock:
+        _drop_dead()
+        mirrored = _cache.get(key)
+    if mirrored is not None:
+        return mirrored  # a worker or the queue got there first
+    mirrored = pygame.transform.flip(surf, flip_x, flip_y)
+    if _is_rle(surf):
+        mirrored.set_alpha(255, pygame.RLEACCEL)
+    with _lock:
+        if key in _cache:
+            return _cache[key]
+        if surf not in _tracked:
+            _tracked.add(surf)
+            weakref.finalize(surf, _forget, id(surf))
+        _cache[key] = mirrored
+        _stats["bytes"] += resload.resource_size(mirrored)
+        _stats["built"] += 1
+    return mirrored
+
+
+def _forget(src_id: int):
+    # the source Surface died, its mirrors can never be asked for again. Runs as a
+    # finalizer, possibly from a GC pass inside a _lock block, so it must not take
+    # the lock: the entries are dropped by the next _drop_dead
+    _dead.append(src_id)
+
+
+def _drop_dead():
+    # call with _lock held
+    while _dead:
+        src_id = _dead.pop()
+        for key in [k for k in _cache if k[0] == src_id]:
+            _stats["bytes"] -= resload.resource_size(_cache.pop(key))
+
+
+def _on_reload(key, old, new):
+    if old is not None:
+        _forget(id(old))
+
+
+resload.add_reload_listener(_on_reload)
+
+
+def set_mirror_threads(enabled: bool = True):
+    """Allow prebuild_mirrored to use a worker thread (disable where there are no threads)."""
+    global _threads
+    _threads = enabled
+
+
+def prebuild_mirrored(frames, flip_x: bool = True, flip_y: bool = False, background: bool = True):
+    """Build the mirrors of frames (None entries are skipped) now, or in the background."""
+    global _pool
+    flip_x = bool(flip_x)
+    flip_y = bool(flip_y)
+    if not (flip_x or flip_y):
+        return
+    if _dead:
+        with _lock:
+            _drop_dead()
+    for surf in frames:
+        if surf is None or (id(surf), flip_x, flip_y) in _cache:
+            continue
+        if not background:
+            _build(surf, flip_x, flip_y)
+        elif _threads and not _is_rle(surf):
+            if _pool is None:
+                _pool = ThreadPoolExecutor(1, thread_name_prefix="mirrors")
+            _pool.submit(_build, surf, flip_x, flip_y)
+        else:
+            _queue.append((weakref.ref(surf), flip_x, flip_y))
+
+
+def pump_mirrors(budget_ms: float = 2.0) -> int:
+    """
+    Build queued mirrors, spending at most about budget_ms (at least one per call).
+    Call once per frame from the main thread. Returns how many are still queued.
+    """
+    start = time.perf_counter()
+    while _queue:
+        ref, flip_x, flip_y = _queue.popleft()
+        surf = ref()
+        if surf is not None:
+            _build(surf, flip_x, flip_y)
+        if (time.perf_counter() - start) * 1000.0 >= budget_ms:
+            break
+    return len(_queue)
+
+
+def get_stats() -> dict:
+    """Return counters: bytes, mirrors built, cache hits, entry count and queue length."""
+    with _lock:
+        _drop_dead()
+    return {**_stats, "count": len(_cache), "queued": len(_queue)}
+
+
+def clear():
+    """Drop all mirrors (and the queue), e.g. after frames were changed in place."""
+    with _lock:
+        _dead.clear()
+        _cache.clear()
+        _stats["bytes"] = 0
+    _queue.clear()
@@ -1,4 +1,5 @@
 from typing import Any, Optional
+import io
 import time
 import pygame
 from . import resload
@@ -69,10 +70,19 @@ def play(identifier: str, loops: int = -1, fade_ms: int = 0, start_pos: float =
     _current_channel = None
     _current_type = None
 
+    # encoded bytes (bundled streamable music) are streamed from memory; pygame closes
+    # the file object when the music is unloaded, so wrap them anew on every play
+    if isinstance(resource, (bytes, bytearray, memoryview)):
+        resource = io.BytesIO(resource)
+
     # If resource is a path/filename or file-like, use pygame.mixer.music (streaming)
     if isinstance(resource, str) or hasattr(resource, "read"):
         try:
-            pygame.mixer.music.load(resource)
+            if isinstance(resource, str):
+                pygame.mixer.music.load(resource)
+            else:
+                # file-like objects need the format from the identifier's extension
+                pygame.mixer.music.load(resource, identifier.rpartition(".")[2])
             pygame.mixer.music.set_volume(_bgm_volume)
             # pygame.mixer.music.play(loops, start, fade_ms)
             pygame.mixer.music.play(loops=loops, start=start_pos, fade_ms=fade_ms)
@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+resbundle.py - single-file resource bundle packed from the res/ directory.
+
+Layout (all integers little-endian):
+  - header: MAGIC (8 bytes) + 8 reserved bytes
+  - blobs, each starting on a BLOB_ALIGN boundary
+  - index: UTF-8 JSON mapping resource key -> entry
+  - footer: index offset (u64), index length (u64), MAGIC (8 bytes)
+
+Images are stored pre-decoded as raw RGB/RGBA rows ("raw" codec) so they can be
+wrapped in Surfaces straight from the memory-mapped file, or zlib-compressed
+("zlib" codec) for a smaller bundle at the cost of an inflate per image.
+Everything else keeps its original file bytes.
+
+Build with:  python -m pygametest.resbundle ./res ./res.bundle [--compress]
+"""
+
+import argparse
+import json
+import mmap
+import struct
+import sys
+import zlib
+from pathlib import Path
+
+import pygame
+
+MAGIC = b"PLBNDL01"
+BLOB_ALIGN = 64
+_FOOTER = struct.Struct("<QQ8s")
+
+# file type groups, mirrors resload
+_IMAGE_EXTS = {".png", ".jpg", ".jpeg", ".bmp", ".gif", ".tga", ".webp"}
+_SOUND_EXTS = {".wav", ".ogg", ".mp3", ".flac"}
+_FONT_EXTS = {".ttf", ".otf"}
+
+
+def _kind_for(path: Path) -> str:
+    ext = path.suffix.lower()
+    if ext in _IMAGE_EXTS:
+        return "image"
+    if ext in _SOUND_EXTS:
+        return "sound"
+    if ext in _FONT_EXTS:
+        return "font"
+    return "bytes"
+
+
+class ResourceBundle:
+    """
+    Read-only view of a bundle file. The file is memory-mapped copy-on-write, so
+    pages are only read from disk when touched and Surfaces built on top of the
+    mapping can never modify the file. Keep the bundle open while any resource
+    built from it is alive.
+    """
+
+    def __init__(self, path: Path | str):
+        self.path = Path(path)
+        self._file = open(self.path, "rb")
+        self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_COPY)
+        self._view = memoryview(self._mm)
+
+        if len(self._mm) < 16 + _FOOTER.size or self._mm[:8] != MAGIC:
+            raise ValueError(f"Not a resource bundle: {self.path}")
+        index_off, index_len, magic = _FOOTER.unpack_from(self._mm, len(self._mm) - _FOOTER.size)
+        if magic != MAGIC:
+            raise ValueError(f"Truncated resource bundle: {self.path}")
+        self.entries: dict[str, dict] = json.loads(bytes(self._view[index_off:index_off + index_len]))
+
+    def keys(self) -> list[str]:
+        return list(self.entries.keys())
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.entries
+
+    def entry(self, key: str) -> dict:
+        return self.entries[key]
+
+    def data(self, key: str):
+        """
+        Return the stored bytes of an entry: a zero-copy memoryview into the mapping
+        for raw entries, or freshly inflated bytes for compressed ones.
+        """
+        e = self.entries[key]
+        blob = self._view[e["offset"]:e["offset"] + e["length"]]
+        if e.get("codec") == "zlib":
+            return zlib.decompress(blob)
+        return blob
+
+
+def build_bundle(res_dir: Path | str, out_path: Path | str, compress: bool = False) -> int:
+    """
+    Pack every file under res_dir into a bundle at out_path.
+    Keys are the same relative posix paths resload uses. Returns the entry count.
+    """
+    res_dir = Path(res_dir)
+    files = sorted((p for p in res_dir.rglob("*")
+                    if p.is_file() and not any(part.startswith(".") for part in p.relative_to(res_dir).parts)),
+                   key=lambda p: p.as_posix())
+    entries = {}
+
+    with open(out_path, "wb") as out:
+        out.write(MAGIC + bytes(8))
+        for p in files:
+            key = p.relative_to(res_dir).as_posix()
+            kind = _kind_for(p)
+            entry = {"kind": kind, "codec": "raw"}
+            data = None
+            if kind == "image":
+                try:
+                    surf = pygame.image.load(str(p))
+                    fmt = "RGBA" if surf.get_flags() & pygame.SRCALPHA else "RGB"
+                    data = pygame.image.tobytes(surf, fmt)
+                    entry.update(size=list(surf.get_size()), format=fmt)
+                except Exception:
+                    # undecodable image, keep its bytes like resload does
+                    entry["kind"] = "bytes"
+            if data is None:
+                data = p.read_bytes()
+            if compress and entry["kind"] == "image":
+                data = zlib.compress(data, 1)
+                entry["codec"] = "zlib"
+
+            pad = -out.tell() % BLOB_ALIGN
+            out.write(bytes(pad))
+            entry["offset"] = out.tell()
+            entry["length"] = len(data)
+            out.write(data)
+            entries[key] = entry
+            print(f"Packed {key} ({len(data)} bytes)")
+
+        index = json.dumps(entries, separators=(",", ":")).encode("utf-8")
+        index_off = out.tell()
+        out.write(index)
+        out.write(_FOOTER.pack(index_off, len(index), MAGIC))
+
+    return len(entries)
+
+
+def parse_args():
+    p = argparse.ArgumentParser(
+        description="Pack a resource directory into a single memory-mappable bundle"
+    )
+    p.add_argument("src", type=Path, help="Resource directory (usually ./res)")
+    p.add_argument("dst", type=Path, help="Bundle file to write (usually ./res.bundle)")
+    p.add_argument(
+        "--compress",
+        action="store_true",
+        help="zlib-compress image pixels (smaller file, images are inflated on load)"
+    )
+    return p.parse_args()
+
+
+def main():
+    args = parse_args()
+    if not args.src.is_dir():
+        print(f"Error: source is not a directory: {args.src}", file=sys.stderr)
+        sys.exit(2)
+    count = build_bundle(args.src, args.dst, args.compress)
+    print(f"Wrote {count} entries to {args.dst}")
+
+
+if __name__ == "__main__":
+    main()
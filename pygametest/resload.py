@@ -1,13 +1,85 @@
 import os
+import multiprocessing
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, as_completed
 from pathlib import Path
+import io
+import asyncio
+import fnmatch
+import hashlib
+import json
+import math
+import time
+import weakref
+from typing import Iterator
 import pygame
 
+from .resbundle import ResourceBundle
+
 # utility to load all files from the resources directory
 # glob all files in resource directory and load according to file extension
 # loads images as surfaces, sounds as Sound objects, and fonts as Font objects
 
 # resource registry: keys are paths relative to ./res/ using forward slashes
-RESOURCES = {}
+# kept in least-recently-used order (oldest first) so the cache can evict from the front
+RESOURCES = OrderedDict()
+
+# lazy-load index: key -> file Path, filled by load_resources_init
+_INDEX: dict[str, Path] = {}
+_INDEX_DIR: Path | None = None
+
+# packed bundle backend, see open_bundle; bundled keys take priority over files
+_BUNDLE: ResourceBundle | None = None
+
+# background preloading, see preload_resources
+_PRELOAD_POOL: ThreadPoolExecutor | None = None
+_PRELOAD_THREADED = True  # False where threads are unavailable (pygbag), see set_preload_threads
+_PENDING = {}  # key -> Future of a decoded, not yet finished resource (None if not threaded)
+_HELD: set[str] = set()  # preloaded keys kept from eviction until release_preloaded
+
+# cache bookkeeping
+_BUDGET: int | None = None  # max decoded bytes kept by the cache, None = unbounded
+_SIZES: dict[str, int] = {}  # key -> estimated decoded size in bytes
+_PINS: dict[str, int] = {}  # key -> pin count; pinned keys are never evicted
+_HOLDERS: dict = {}  # resident Surface -> keys holding it; its size is counted on the first one
+_STATS = {"bytes": 0, "hits": 0, "misses": 0, "evictions": 0}
+
+# load-time surface optimizer, see set_surface_optimizer
+_OPTIMIZE = False
+_PREMULTIPLY = False
+_RLE_COVERAGE = 0.5  # use RLE for sprites with less than this fraction of visible pixels
+_OPTIMIZED = weakref.WeakSet()  # surfaces already in display format
+_PREMULTIPLIED = weakref.WeakSet()  # surfaces that must be blitted with BLEND_PREMULTIPLIED
+
+# transparent-border trimming, see set_trim_patterns
+_TRIM_PATTERNS: tuple = ()
+_TRIMS = weakref.WeakKeyDictionary()  # trimmed surface -> (offset x, offset y, source w, source h)
+
+# resolution tier, see set_tier_scale
+_TIER_SCALE = 1.0  # screen pixels per logical (1920x1080) pixel
+_VARIANT_DIR: Path | None = None  # pre-scaled copies of res/ for the current tier
+_PRESCALED = weakref.WeakSet()  # images loaded from _VARIANT_DIR, already at tier size
+
+# sounds kept as streamable references for pygame.mixer.music, see set_stream_patterns
+_STREAM_PATTERNS: tuple = ()
+
+# load profiling, see set_profiling
+_PROFILING = False
+_PROFILE: dict[str, dict] = {}  # key -> read_ms, decode_ms, finish_ms, bytes, format
+
+# content-hash deduplication, see set_dedup
+_DEDUP = False
+_BY_HASH = weakref.WeakValueDictionary()  # pixel digest -> finished surface
+_DEDUP_SAVED: dict[str, int] = {}  # resource directory -> bytes not allocated thanks to aliasing
+
+# hot reload of changed files, see watch_resources
+_WATCH_INTERVAL: float | None = None  # seconds between polls, None = not watching
+_WATCH_NEXT = 0.0
+_MTIMES: dict[str, int] = {}  # key -> file mtime_ns when last seen
+_RELOAD_LISTENERS: list = []  # callbacks(key, old resource or None, new resource or None)
+
+# parsed frame tables of texture atlases, see get_atlas_table
+_ATLAS_TABLES: dict[str, dict] = {}
 
 # file type groups
 _IMAGE_EXTS = {".png", ".jpg", ".jpeg", ".bmp", ".gif", ".tga", ".webp"}
@@ -34,11 +106,226 @@ def _ensure_pygame_modules():
         pass
 
 
+def _resource_key(path: Path, res_dir: Path) -> str:
+    # compute key relative to res_dir if possible, otherwise use posix path
+    try:
+        return path.relative_to(res_dir).as_posix()
+    except Exception:
+        return path.as_posix()
+
+
+def set_surface_optimizer(enabled: bool = True, premultiply: bool = False, rle_coverage: float = 0.5):
+    """
+    Configure the post-load pass applied to every loaded image.
+    Needs a display mode to be set, images loaded before that are kept as-is.
+    """
+    global _OPTIMIZE, _PREMULTIPLY, _RLE_COVERAGE
+    _OPTIMIZE = enabled
+    _PREMULTIPLY = premultiply
+    _RLE_COVERAGE = rle_coverage
+
+
+def optimize_surface(surf: pygame.Surface) -> pygame.Surface:
+    """
+    Convert a freshly loaded image to the display format:
+      - fully opaque images drop their alpha channel (plain, fastest blits)
+      - sparse sprites get RLE acceleration, which skips transparent runs
+      - optionally, alpha is premultiplied (blit with blit_flags(surf))
+    """
+    if pygame.display.get_surface() is None:
+        return surf
+
+    if not surf.get_flags() & pygame.SRCALPHA:
+        out = surf.convert()
+    else:
+        w, h = surf.get_size()
+        area = w * h
+        if area and pygame.mask.from_surface(surf, 254).count() == area:
+            out = surf.convert()
+        else:
+            out = surf.convert_alpha()
+            if _PREMULTIPLY:
+                out = out.premul_alpha()
+                _PREMULTIPLIED.add(out)
+            if area and pygame.mask.from_surface(surf, 0).count() < area * _RLE_COVERAGE:
+                out.set_alpha(255, pygame.RLEACCEL)
+    _OPTIMIZED.add(out)
+    return out
+
+
+def set_tier_scale(scale: float = 1.0, variant_dir=None):
+    """
+    Set the asset quality tier: 1.0 full, 0.5 half, 0.25 quarter resolution.
+    Images are smoothscaled by this factor on load, unless a pre-built copy of
+    the same key exists under variant_dir. Game code keeps working in logical
+    (full resolution) coordinates; see to_screen and logical_size.
+    """
+    global _TIER_SCALE, _VARIANT_DIR
+    _TIER_SCALE = float(scale)
+    _VARIANT_DIR = Path(variant_dir) if variant_dir is not None and scale != 1.0 else None
+
+
+def tier_scale() -> float:
+    return _TIER_SCALE
+
+
+def to_screen(x: float, y: float) -> tuple[float, float]:
+    """Logical position -> screen pixels for the current tier."""
+    return (x * _TIER_SCALE, y * _TIER_SCALE)
+
+
+def from_screen(pos) -> tuple[float, float]:
+    """Screen pixels (e.g. a mouse position) -> logical position."""
+    return (pos[0] / _TIER_SCALE, pos[1] / _TIER_SCALE)
+
+
+def screen_rect(rect) -> pygame.Rect:
+    """Logical rect -> screen rect for the current tier."""
+    s = _TIER_SCALE
+    return pygame.Rect(round(rect[0] * s), round(rect[1] * s), round(rect[2] * s), round(rect[3] * s))
+
+
+def logical_size(surf: pygame.Surface) -> tuple[float, float]:
+    """Size of a tier-scaled surface in logical pixels."""
+    w, h = surf.get_size()
+    return (w / _TIER_SCALE, h / _TIER_SCALE)
+
+
+def _tier_image(surf: pygame.Surface) -> pygame.Surface:
+    if _TIER_SCALE == 1.0 or surf in _PRESCALED:
+        return surf
+    w, h = surf.get_size()
+    size = (max(1, round(w * _TIER_SCALE)), max(1, round(h * _TIER_SCALE)))
+    if surf.get_bitsize() < 24:
+        # smoothscale only takes 24/32 bit surfaces
+        return pygame.transform.scale(surf, size)
+    return pygame.transform.smoothscale(surf, size)
+
+
+def set_stream_patterns(patterns):
+    """
+    Sounds whose key matches one of these fnmatch patterns (e.g. "bgm/*") are not
+    decoded into Sound objects. Their resource is the absolute file path (or the
+    encoded bytes when bundled) for music.play to stream with pygame.mixer.music.
+    """
+    global _STREAM_PATTERNS
+    _STREAM_PATTERNS = tuple(patterns)
+
+
+def _is_streamed(key: str) -> bool:
+    return any(fnmatch.fnmatchcase(key, pattern) for pattern in _STREAM_PATTERNS)
+
+
+def set_trim_patterns(patterns):
+    """
+    Trim the fully transparent border off loaded images whose key matches one of
+    the fnmatch patterns (e.g. "chr/*/*/*.png"). See get_trim for drawing them.
+    """
+    global _TRIM_PATTERNS
+    _TRIM_PATTERNS = tuple(patterns)
+
+
+def trim_surface(surf: pygame.Surface) -> pygame.Surface:
+    """Return surf cropped to its visible pixels, remembering where the crop came from."""
+    w, h = surf.get_size()
+    rect = surf.get_bounding_rect(min_alpha=1)
+    if rect.size == (w, h) or rect.width == 0 or rect.height == 0:
+        return surf
+    out = surf.subsurface(rect).copy()
+    _TRIMS[out] = (rect.x, rect.y, w, h)
+    return out
+
+
+def get_trim(surf: pygame.Surface) -> tuple[int, int, int, int]:
+    """
+    Return (x, y, source width, source height) for a surface: blit it at (x, y)
+    relative to where the untrimmed image would go. Untrimmed surfaces give (0, 0, w, h).
+    Values are in logical pixels, like positions.
+    """
+    trim = _TRIMS.get(surf) or (0, 0, *surf.get_size())
+    if _TIER_SCALE == 1.0:
+        return trim
+    return tuple(v / _TIER_SCALE for v in trim)
+
+
+def set_dedup(enabled: bool = True):
+    """
+    Hash the pixels of loaded images so identical images under different keys
+    share one Surface. Shared surfaces are counted once in the cache size.
+    """
+    global _DEDUP
+    _DEDUP = enabled
+
+
+def dedup_report() -> list[tuple[str, int]]:
+    """Return (directory, bytes saved) pairs for deduplicated images, largest first."""
+    return sorted(_DEDUP_SAVED.items(), key=lambda item: item[1], reverse=True)
+
+
+def _pixel_digest(surf: pygame.Surface, trim) -> tuple:
+    digest = hashlib.blake2b(surf.get_buffer().raw, digest_size=16).digest()
+    return (surf.get_size(), surf.get_bitsize(), surf.get_flags() & pygame.SRCALPHA, trim, digest)
+
+
+def _finish_image(surf: pygame.Surface, key: str = "") -> pygame.Surface:
+    # main-thread step for every loaded image
+    surf = _tier_image(surf)
+    trim = None
+    if _TRIM_PATTERNS and any(fnmatch.fnmatchcase(key, pattern) for pattern in _TRIM_PATTERNS):
+        surf = trim_surface(surf)
+        trim = _TRIMS.get(surf)
+
+    digest = None
+    if _DEDUP:
+        # hash before optimizing, RLE surfaces would have to be decoded to be read
+        digest = _pixel_digest(surf, trim)
+        shared = _BY_HASH.get(digest)
+        if shared is not None:
+            directory = key.rpartition("/")[0]
+            _DEDUP_SAVED[directory] = _DEDUP_SAVED.get(directory, 0) + resource_size(shared)
+            return shared
+
+    if _OPTIMIZE:
+        surf = optimize_surface(surf)
+        if trim is not None:
+            _TRIMS[surf] = trim
+    if digest is not None:
+        _BY_HASH[digest] = surf
+    return surf
+
+
+def is_optimized(surf: pygame.Surface) -> bool:
+    """True if surf already went through optimize_surface."""
+    return surf in _OPTIMIZED
+
+
+def blit_flags(surf: pygame.Surface) -> int:
+    """special_flags to use when blitting a loaded resource surface."""
+    return pygame.BLEND_PREMULTIPLIED if surf in _PREMULTIPLIED else 0
+
+
+def resource_size(resource) -> int:
+    """Estimate how many bytes a loaded resource keeps resident."""
+    if isinstance(resource, pygame.Surface):
+        return resource.get_pitch() * resource.get_height()
+    if isinstance(resource, pygame.mixer.Sound):
+        init = pygame.mixer.get_init()
+        if init:
+            freq, fmt, channels = init
+            return int(resource.get_length() * freq * channels * (abs(fmt) // 8))
+        return 0
+    if isinstance(resource, (bytes, bytearray)):
+        return len(resource)
+    return 0
+
+
 def load_resources_init(res_dir: Path | str | None = None) -> list[Path]:
     """
     Return a list of file Paths under res_dir that should be loaded.
-    Does not modify RESOURCES or perform any pygame loading.
+    Does not modify RESOURCES or perform any pygame loading, but records the
+    files in the lazy-load index so get_resource can load them on first use.
     """
+    global _INDEX_DIR
     if res_dir is None:
         res_dir = Path(__file__).parent / "res"
     res_dir = Path(res_dir)
@@ -46,62 +333,476 @@ def load_resources_init(res_dir: Path | str | None = None) -> list[Path]:
     if not res_dir.exists():
         return []
 
-    files = [p for p in res_dir.rglob("*") if p.is_file()]
+    # dotfiles and dot directories are build metadata (e.g. resize_assets.py manifests), not resources
+    files = [p for p in res_dir.rglob("*")
+             if p.is_file() and not any(part.startswith(".") for part in p.relative_to(res_dir).parts)]
     # deterministic order
     files.sort(key=lambda p: p.as_posix())
+
+    _INDEX.clear()
+    for p in files:
+        _INDEX[_resource_key(p, res_dir)] = p
+    _INDEX_DIR = res_dir
     return files
 
 
-def load_resource(path: Path | str, res_dir: Path | str | None = None):
+def set_profiling(enabled: bool = True):
     """
-    Load a single file and store it in the global RESOURCES dict.
-    Returns the loaded resource (Surface, Sound, Font, bytes, or None).
-    If res_dir is provided it is used to compute the resource key (relative path).
+    Record per-resource read time, decode time, main-thread finish time, decoded
+    size and format; see get_load_profile. Clears earlier records.
+    While profiling, files are read into memory before decoding so both are timed.
     """
-    global RESOURCES
-    _ensure_pygame_modules()
+    global _PROFILING
+    _PROFILING = enabled
+    _PROFILE.clear()
 
-    path = Path(path)
-    if res_dir is None:
-        res_dir = Path(__file__).parent / "res"
-    res_dir = Path(res_dir)
 
-    try:
-        # compute key relative to res_dir if possible, otherwise use posix path
-        try:
-            key = path.relative_to(res_dir).as_posix()
-        except Exception:
-            key = path.as_posix()
+def get_load_profile() -> dict[str, dict]:
+    """Return the records collected since set_profiling, keyed by resource key."""
+    return _PROFILE
+
+
+def _profile(key: str, **fields):
+    _PROFILE.setdefault(key, {}).update(fields)
+
+
+def describe_format(resource) -> str:
+    """Short description of how a resource is held in memory, e.g. "32bpp alpha rle"."""
+    if isinstance(resource, pygame.Surface):
+        desc = f"{resource.get_bitsize()}bpp"
+        flags = resource.get_flags()
+        if flags & pygame.SRCALPHA:
+            desc += " alpha"
+        if flags & (pygame.RLEACCEL | pygame.RLEACCELOK):
+            desc += " rle"
+        if resource in _PREMULTIPLIED:
+            desc += " premul"
+        return desc
+    if isinstance(resource, pygame.mixer.Sound):
+        return "pcm"
+    if isinstance(resource, str):
+        return "stream"
+    if resource is None:
+        return "missing"
+    return type(resource).__name__
 
+
+def _variant_path(key: str) -> Path | None:
+    """The prescaled copy of an image in _VARIANT_DIR (./res-<tier>/), if there is one."""
+    if _VARIANT_DIR is None or not key:
+        return None
+    variant = _VARIANT_DIR / key
+    return variant if variant.is_file() else None
+
+
+def _read_file(path: Path, key: str = ""):
+    """
+    Decode a single file according to its extension, without touching the cache.
+    Safe to call from a worker thread; images still need _finish on the main thread.
+    """
+    try:
         ext = path.suffix.lower()
 
-        if ext in _IMAGE_EXTS:
+        start = time.perf_counter()
+        source = str(path)
+        if _PROFILING:
+            # read up front so the read and the decode can be timed separately
+            source = io.BytesIO(path.read_bytes())
+        read_done = time.perf_counter()
+
+        if ext in _SOUND_EXTS and _is_streamed(key):
+            resource = str(path.resolve())
+        elif ext in _IMAGE_EXTS:
             try:
-                resource = pygame.image.load(str(path))
+                variant = _variant_path(key)
+                if variant is not None:
+                    resource = pygame.image.load(str(variant))
+                    _PRESCALED.add(resource)
+                else:
+                    resource = pygame.image.load(source, path.name)
             except Exception:
                 resource = path.read_bytes()
         elif ext in _SOUND_EXTS:
             try:
-                resource = pygame.mixer.Sound(str(path))
+                resource = pygame.mixer.Sound(source)
             except Exception:
                 resource = path.read_bytes()
         elif ext in _FONT_EXTS:
             try:
-                resource = pygame.font.Font(str(path), 16)
+                resource = pygame.font.Font(source, 16)
             except Exception:
                 resource = path.read_bytes()
         else:
             resource = path.read_bytes()
+
+        if _PROFILING:
+            _profile(key, read_ms=(read_done - start) * 1000.0, decode_ms=(time.perf_counter() - read_done) * 1000.0)
     except Exception:
         try:
             resource = path.read_bytes()
         except Exception:
             resource = None
+    return resource
+
+
+def _finish(resource, key: str):
+    # main-thread step for every loaded resource
+    if isinstance(resource, pygame.Surface):
+        start = time.perf_counter()
+        resource = _finish_image(resource, key)
+        if _PROFILING:
+            _profile(key, finish_ms=(time.perf_counter() - start) * 1000.0)
+    return resource
 
+
+def load_resource(path: Path | str, res_dir: Path | str | None = None):
+    """
+    Load a single file and store it in the global RESOURCES dict.
+    Returns the loaded resource (Surface, Sound, Font, bytes, or None).
+    If res_dir is provided it is used to compute the resource key (relative path).
+    """
+    global RESOURCES
+    _ensure_pygame_modules()
+
+    path = Path(path)
+    if res_dir is None:
+        res_dir = Path(__file__).parent / "res"
+    res_dir = Path(res_dir)
+
+    key = _resource_key(path, res_dir)
+    resource = _finish(_read_file(path, key), key)
+    _store(key, resource)
+    return resource
+
+
+def _store(key: str, resource):
+    """Put a resource in the cache as most recently used, then enforce the budget."""
+    if key in RESOURCES:
+        _drop(key)
+    size = resource_size(resource)
+    if isinstance(resource, pygame.Surface):
+        holders = _HOLDERS.setdefault(resource, [])
+        if holders:
+            size = 0  # a deduplicated surface already resident under another key costs nothing extra
+        holders.append(key)
     RESOURCES[key] = resource
+    _SIZES[key] = size
+    if _PROFILING:
+        _profile(key, bytes=size, format=describe_format(resource))
+    _STATS["bytes"] += size
+    _evict(keep=key)
+
+
+def _evict(keep: str | None = None):
+    """Drop least recently used, unpinned resources until the cache fits its budget."""
+    if _BUDGET is None or _STATS["bytes"] <= _BUDGET:
+        return
+    for key in list(RESOURCES.keys()):
+        if _STATS["bytes"] <= _BUDGET:
+            break
+        if key == keep or key in _HELD or _PINS.get(key, 0) > 0:
+            continue
+        _drop(key)
+        _STATS["evictions"] += 1
+
+
+def _drop(key: str):
+    """Remove a key from the cache. A Surface other keys still hold stays counted, on one of them."""
+    resource = RESOURCES.pop(key)
+    size = _SIZES.pop(key, 0)
+    holders = _HOLDERS.get(resource) if isinstance(resource, pygame.Surface) else None
+    if holders is not None:
+        holders.remove(key)
+        if holders:
+            _SIZES[holders[0]] += size
+            return
+        del _HOLDERS[resource]
+    _STATS["bytes"] -= size
+
+
+def set_cache_budget(budget_bytes: int | None):
+    """
+    Limit the decoded size of the resource cache; None disables the limit.
+    Pinned resources always stay resident, even if they alone exceed the budget.
+    """
+    global _BUDGET
+    _BUDGET = budget_bytes
+    _evict()
+
+
+def get_cache_stats() -> dict:
+    """Return cache counters: resident bytes, budget, entry counts, hits, misses, evictions."""
+    return {
+        **_STATS,
+        "budget": _BUDGET,
+        "count": len(RESOURCES),
+        "pinned": sum(1 for n in _PINS.values() if n > 0),
+        "indexed": len(_INDEX.keys() | (_BUNDLE.entries.keys() if _BUNDLE is not None else set())),
+    }
+
+
+def pin_resource(key: str, default=None):
+    """
+    Like get_resource, but keep the resource resident until unpin_resource is
+    called for it as many times as it was pinned.
+    """
+    resource = get_resource(key, default)
+    if key in RESOURCES:
+        _PINS[key] = _PINS.get(key, 0) + 1
+    return resource
+
+
+def unpin_resource(key: str):
+    """Release one pin on key; the resource becomes evictable when no pins remain."""
+    count = _PINS.get(key, 0) - 1
+    if count > 0:
+        _PINS[key] = count
+    else:
+        _PINS.pop(key, None)
+        _evict()
+
+
+def open_bundle(path: Path | str) -> list[str]:
+    """
+    Use a packed bundle (see resbundle.py) as the resource backend.
+    Returns the bundled keys; they are loaded from the mapped file on first use
+    or with load_bundled_resource.
+    """
+    global _BUNDLE
+    _BUNDLE = ResourceBundle(path)
+    return _BUNDLE.keys()
+
+
+def _read_bundled(key: str):
+    # build a resource from the open bundle, without touching the cache
+    start = time.perf_counter()
+    entry = _BUNDLE.entry(key)
+    data = _BUNDLE.data(key)
+    kind = entry["kind"]
+    read_done = time.perf_counter()
+    try:
+        if kind == "image":
+            resource = pygame.image.frombuffer(data, tuple(entry["size"]), entry["format"])
+        elif kind == "sound" and _is_streamed(key):
+            # still-encoded bytes, a view into the mapping for uncompressed bundles
+            resource = data
+        elif kind == "sound":
+            resource = pygame.mixer.Sound(io.BytesIO(data))
+        elif kind == "font":
+            resource = pygame.font.Font(io.BytesIO(data), 16)
+        else:
+            resource = bytes(data)
+    except Exception:
+        resource = bytes(data)
+    if _PROFILING:
+        _profile(key, read_ms=(read_done - start) * 1000.0, decode_ms=(time.perf_counter() - read_done) * 1000.0)
+    return resource
+
+
+def load_bundled_resource(key: str):
+    """
+    Build a resource from the open bundle and store it in RESOURCES.
+    Raw images wrap the mapped pixels directly, without a copy or decode.
+    """
+    _ensure_pygame_modules()
+    resource = _finish(_read_bundled(key), key)
+    _store(key, resource)
     return resource
 
 
+def _read_key(key: str):
+    # decode an indexed resource from whichever backend has it
+    if _BUNDLE is not None and key in _BUNDLE:
+        return _read_bundled(key)
+    return _read_file(_INDEX[key], key)
+
+
+def resolve_manifest(patterns) -> list[str]:
+    """
+    Expand a resource manifest (exact keys or fnmatch globs such as "title/*" or
+    "chr/0/*/*.png") into the sorted list of matching indexed keys.
+    """
+    known = _INDEX.keys() | (_BUNDLE.entries.keys() if _BUNDLE is not None else set())
+    keys = set()
+    for pattern in patterns:
+        if pattern in known:
+            keys.add(pattern)
+        else:
+            keys.update(fnmatch.filter(known, pattern))
+    return sorted(keys)
+
+
+def set_preload_threads(enabled: bool):
+    """
+    Choose how preload_resources works: decode on a background thread (default),
+    or, where threads are unavailable, queue keys and decode them in
+    pump_preloaded's per-frame time slices on the main thread.
+    """
+    global _PRELOAD_THREADED
+    _PRELOAD_THREADED = enabled
+
+
+def preload_resources(keys):
+    """
+    Queue keys for decoding on a background thread. Finished resources are moved
+    into RESOURCES by pump_preloaded on the main thread; get_resource on a key
+    still in flight waits for it. Preloaded resources are not evicted until
+    release_preloaded is called.
+    """
+    global _PRELOAD_POOL
+    _ensure_pygame_modules()
+    if _PRELOAD_THREADED and _PRELOAD_POOL is None:
+        _PRELOAD_POOL = ThreadPoolExecutor(1, thread_name_prefix="preload")
+    for key in keys:
+        if key in RESOURCES or key in _PENDING:
+            continue
+        _PENDING[key] = _PRELOAD_POOL.submit(_read_key, key) if _PRELOAD_THREADED else None
+
+
+def _complete_preload(key: str):
+    fut = _PENDING.pop(key)
+    try:
+        resource = _finish(fut.result() if fut is not None else _read_key(key), key)
+    except Exception:
+        resource = None
+    _HELD.add(key)
+    _store(key, resource)
+    return resource
+
+
+def release_preloaded():
+    """Let the cache evict preloaded resources again, e.g. once they were pinned by their user."""
+    _HELD.clear()
+    _evict()
+
+
+def pump_preloaded(budget_ms: float = 4.0) -> int:
+    """
+    Store background-decoded resources, spending at most about budget_ms.
+    Without preload threads the queued keys are decoded here instead, at least one per call.
+    Call once per frame from the main thread. Returns how many are still pending.
+    """
+    start = time.perf_counter()
+    for key, fut in list(_PENDING.items()):
+        if fut is not None and not fut.done():
+            continue
+        _complete_preload(key)
+        if (time.perf_counter() - start) * 1000.0 >= budget_ms:
+            break
+    return len(_PENDING)
+
+
+def unload_resources(keys):
+    """Drop unpinned resources (and cancel their pending preloads) right away."""
+    for key in keys:
+        fut = _PENDING.pop(key, None)
+        if fut is not None:
+            fut.cancel()
+        _HELD.discard(key)
+        if key in RESOURCES and _PINS.get(key, 0) <= 0:
+            _drop(key)
+
+
+async def load_resources_async(keys, budget_ms: float = 8.0, pin: bool = False, progress=None):
+    """
+    Load keys on the event loop's thread in slices of about budget_ms, yielding
+    to the loop between slices so a browser tab stays responsive.
+    progress(done, total) is called once per slice, before yielding.
+    With pin, each resource is pinned as it loads (see pin_resource).
+    """
+    total = len(keys)
+    start = time.perf_counter()
+    for done, key in enumerate(keys, 1):
+        if pin:
+            pin_resource(key)
+        else:
+            get_resource(key)
+        if (time.perf_counter() - start) * 1000.0 >= budget_ms or done == total:
+            if progress is not None:
+                progress(done, total)
+            await asyncio.sleep(0)
+            start = time.perf_counter()
+
+
+async def resources_ready(patterns, budget_ms: float = 8.0):
+    """Await until every resource matching a manifest (keys or globs) is resident."""
+    keys = [key for key in resolve_manifest(patterns) if key not in RESOURCES]
+    await load_resources_async(keys, budget_ms)
+
+
+def _decode_image(path_str: str, to_bytes: bool):
+    """
+    Worker-side image decode. Runs in a pool thread (pygame releases the GIL while
+    decoding) or in a pool process, in which case raw pixels are returned instead
+    of a Surface since Surfaces cannot be pickled.
+    """
+    surf = pygame.image.load(path_str)
+    if not to_bytes:
+        return surf
+    fmt = "RGBA" if surf.get_flags() & pygame.SRCALPHA else "RGB"
+    return fmt, surf.get_size(), pygame.image.tobytes(surf, fmt)
+
+
+def load_resources_parallel(
+    files: list[Path],
+    res_dir: Path | str | None = None,
+    workers: int | None = None,
+    processes: bool = False,
+) -> Iterator[Path]:
+    """
+    Load files using a worker pool, yielding each Path as it finishes loading.
+    Image decoding happens in the workers (threads, or processes if `processes`);
+    building Surfaces from process results and loading sounds, fonts and other
+    files happens on the calling thread, which should be the main thread.
+    """
+    _ensure_pygame_modules()
+    if res_dir is None:
+        res_dir = Path(__file__).parent / "res"
+    res_dir = Path(res_dir)
+
+    images = [p for p in files if p.suffix.lower() in _IMAGE_EXTS]
+    others = [p for p in files if p.suffix.lower() not in _IMAGE_EXTS]
+
+    if processes:
+        # spawn, since forking a process that owns an SDL window is unsafe
+        executor = ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context("spawn"))
+    else:
+        executor = ThreadPoolExecutor(workers)
+
+    with executor:
+        futures = {}
+        variants = set()  # files decoded from their prescaled copy
+        for p in images:
+            variant = _variant_path(_resource_key(p, res_dir))
+            if variant is not None:
+                variants.add(p)
+            futures[executor.submit(_decode_image, str(variant or p), processes)] = p
+
+        # the main thread handles the rest while the pool decodes images
+        for p in others:
+            load_resource(p, res_dir)
+            yield p
+
+        for fut in as_completed(futures):
+            p = futures[fut]
+            key = _resource_key(p, res_dir)
+            try:
+                decoded = fut.result()
+                if processes:
+                    fmt, size, data = decoded
+                    decoded = pygame.image.frombuffer(data, size, fmt)
+                if p in variants:
+                    _PRESCALED.add(decoded)
+                resource = _finish_image(decoded, key)
+            except Exception:
+                try:
+                    resource = p.read_bytes()
+                except Exception:
+                    resource = None
+            _store(key, resource)
+            yield p
+
+
 def load_resources(res_dir: Path | str | None = None) -> dict:
     """
     Clear and load all resources under res_dir into the global RESOURCES dict.
@@ -109,6 +810,10 @@ def load_resources(res_dir: Path | str | None = None) -> dict:
     """
     global RESOURCES
     RESOURCES.clear()
+    _SIZES.clear()
+    _HOLDERS.clear()
+    _ATLAS_TABLES.clear()
+    _STATS["bytes"] = 0
 
     files = load_resources_init(res_dir)
     for p in files:
@@ -117,11 +822,203 @@ def load_resources(res_dir: Path | str | None = None) -> dict:
     return RESOURCES
 
 
+def get_resource_bytes(key: str) -> bytes | None:
+    """Return the undecoded file bytes of an indexed resource (bundle or file), or None."""
+    if _BUNDLE is not None and key in _BUNDLE and _BUNDLE.entry(key)["kind"] != "image":
+        # bundled images are stored decoded, only other kinds keep their file bytes
+        return bytes(_BUNDLE.data(key))
+    path = _INDEX.get(key)
+    if path is None:
+        return None
+    return path.read_bytes()
+
+
+def is_loaded(key: str) -> bool:
+    """True if key is resident, i.e. get_resource will not have to load or wait for it."""
+    return key in RESOURCES
+
+
+def has_resource(key: str) -> bool:
+    """True if key is resident or can be loaded from the index or bundle."""
+    return key in RESOURCES or key in _INDEX or (_BUNDLE is not None and key in _BUNDLE)
+
+
+def get_atlas_table(key: str) -> dict:
+    """
+    Return the parsed frame table of an atlas written by resize_assets.py --atlas:
+    {"pages": [page file names], "animations": {name: [{"page", "rect", "trim"}, ...]}}
+    Page names are relative to the table's directory; frames are in animation order.
+    """
+    table = _ATLAS_TABLES.get(key)
+    if table is None:
+        data = get_resource_bytes(key)
+        if data is None:
+            raise KeyError(key)
+        table = _ATLAS_TABLES[key] = json.loads(data)
+    return table
+
+
+def atlas_frame(page: pygame.Surface, entry: dict) -> pygame.Surface:
+    """
+    Cut one frame of an atlas table out of its (loaded) page as a subsurface.
+    The frame keeps the page's optimizer state and gets its trim registered,
+    so get_trim, blit_flags and logical_size work as for a separately loaded frame.
+    """
+    s = _TIER_SCALE
+    x, y, w, h = entry["rect"]
+    tx, ty, src_w, src_h = entry["trim"]
+    if s != 1.0:
+        # the page was scaled as a whole, round outwards to keep edge pixels
+        x0, y0 = math.floor(x * s), math.floor(y * s)
+        x1 = min(page.get_width(), math.ceil((x + w) * s))
+        y1 = min(page.get_height(), math.ceil((y + h) * s))
+        tx, ty = tx * s - (x * s - x0), ty * s - (y * s - y0)
+        src_w, src_h = src_w * s, src_h * s
+        x, y, w, h = x0, y0, max(1, x1 - x0), max(1, y1 - y0)
+    if page.get_flags() & (pygame.RLEACCEL | pygame.RLEACCELOK):
+        # only the frames are ever blitted, they get RLE of their own below
+        page.set_alpha(255)
+    frame = page.subsurface((x, y, w, h))
+    _TRIMS[frame] = (tx, ty, src_w, src_h)
+    if page in _OPTIMIZED:
+        _OPTIMIZED.add(frame)
+        if page in _PREMULTIPLIED:
+            _PREMULTIPLIED.add(frame)
+        area = w * h
+        if page.get_flags() & pygame.SRCALPHA and pygame.mask.from_surface(frame, 0).count() < area * _RLE_COVERAGE:
+            frame.set_alpha(255, pygame.RLEACCEL)
+    return frame
+
+
 def get_resource(key: str, default=None):
-    """Return a loaded resource by its relative-res key."""
-    return RESOURCES.get(key, default)
+    """
+    Return a resource by its relative-res key.
+    Resources that are indexed but not resident are loaded on first use.
+    """
+    if key in RESOURCES:
+        RESOURCES.move_to_end(key)
+        _STATS["hits"] += 1
+        return RESOURCES[key]
+    if key in _PENDING:
+        _STATS["misses"] += 1
+        return _complete_preload(key)
+    if _BUNDLE is not None and key in _BUNDLE:
+        _STATS["misses"] += 1
+        return load_bundled_resource(key)
+    path = _INDEX.get(key)
+    if path is None:
+        return default
+    _STATS["misses"] += 1
+    return load_resource(path, _INDEX_DIR)
 
 
 def reload_resources(res_dir: Path | str | None = None):
     """Clear and reload resources from disk."""
-    return load_resources(res_dir)
\ No newline at end of file
+    return load_resources(res_dir)
+
+
+def add_reload_listener(callback):
+    """
+    Call callback(key, old, new) whenever reload_resource replaces a resource
+    object instead of updating it in place, so holders of the old object can
+    swap it. old and new are None for keys that were not resident.
+    """
+    _RELOAD_LISTENERS.append(callback)
+
+
+def watch_resources(enabled: bool = True, interval: float = 1.0):
+    """
+    Opt in to hot reload: poll_resource_changes then checks the files under the
+    indexed resource directory every `interval` seconds and reloads changed ones.
+    Bundled resources are not watched.
+    """
+    global _WATCH_INTERVAL, _WATCH_NEXT
+    _WATCH_INTERVAL = interval if enabled else None
+    _WATCH_NEXT = time.perf_counter() + interval
+    _MTIMES.clear()
+    if enabled:
+        for key, path in _INDEX.items():
+            try:
+                _MTIMES[key] = path.stat().st_mtime_ns
+            except OSError:
+                pass
+
+
+def _scan_mtimes(directory: str, prefix: str) -> Iterator[tuple[str, int]]:
+    # (key, mtime_ns) of every file below directory; scandir avoids a stat per entry type check
+    try:
+        entries = list(os.scandir(directory))
+    except OSError:
+        return
+    for entry in entries:
+        if entry.name.startswith("."):
+            continue
+        try:
+            if entry.is_dir():
+                yield from _scan_mtimes(entry.path, prefix + entry.name + "/")
+            elif entry.is_file():
+                yield prefix + entry.name, entry.stat().st_mtime_ns
+        except OSError:
+            continue  # removed while scanning
+
+
+def poll_resource_changes() -> list[str]:
+    """
+    Reload the resources whose files changed (or appeared) since the last poll.
+    Cheap to call every frame; the directory is only scanned once per interval.
+    Returns the reloaded keys.
+    """
+    global _WATCH_NEXT
+    if _WATCH_INTERVAL is None or _INDEX_DIR is None or time.perf_counter() < _WATCH_NEXT:
+        return []
+    changed = []
+    for key, mtime in _scan_mtimes(str(_INDEX_DIR), ""):
+        if _MTIMES.get(key) != mtime:
+            _MTIMES[key] = mtime
+            _INDEX[key] = _INDEX_DIR / key
+            changed.append(key)
+    for key in changed:
+        reload_resource(key)
+    _WATCH_NEXT = time.perf_counter() + _WATCH_INTERVAL
+    return changed
+
+
+def _update_in_place(old, new) -> bool:
+    # copy new pixels into the old Surface so every holder sees them
+    if not isinstance(old, pygame.Surface) or not isinstance(new, pygame.Surface):
+        return False
+    if (old.get_size() != new.get_size() or old.get_bitsize() != new.get_bitsize()
+            or old.get_pitch() != new.get_pitch() or old.get_masks() != new.get_masks()
+            or _TRIMS.get(old) != _TRIMS.get(new) or (old in _PREMULTIPLIED) != (new in _PREMULTIPLIED)):
+        return False
+    if len(_HOLDERS.get(old, ())) > 1:
+        return False  # deduplicated, other keys must keep the old pixels
+    old.get_buffer().write(new.get_buffer().raw)
+    for digest, surf in list(_BY_HASH.items()):
+        if surf is old:
+            del _BY_HASH[digest]  # its content no longer matches the digest
+    return True
+
+
+def reload_resource(key: str) -> bool:
+    """
+    Re-read one resource from its file. A resident Surface of unchanged size and
+    format is updated in place; anything else is replaced in the cache and
+    announced to the reload listeners. Returns True if it was updated in place.
+    """
+    _ATLAS_TABLES.pop(key, None)
+    future = _PENDING.pop(key, None)
+    if future is not None:
+        future.cancel()
+    old = RESOURCES.get(key)
+    if old is None:
+        for callback in _RELOAD_LISTENERS:
+            callback(key, None, None)
+        return False
+    new = _finish(_read_file(_INDEX[key], key), key)
+    if new is old or _update_in_place(old, new):
+        return True
+    _store(key, new)
+    for callback in _RELOAD_LISTENERS:
+        callback(key, old, new)
+    return False
\ No newline at end of file
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+resprofile.py - load every resource headlessly and report where load time and
+memory go, per file or aggregated by directory (e.g. chr/0/death).
+
+Resources are loaded with the game's own resload settings, so the game's
+command-line flags (--no-trim, --no-optimize, --premultiply, --no-dedup,
+--no-stream-bgm, --bundle, --tier ...) apply here too. The tier is full unless
+--tier says otherwise (the game would pick one from the dummy display's size).
+
+Run from the project root:
+  python -m pygametest.resprofile [--by file|dir] [--sort time|bytes] [--json out.json]
+"""
+
+import argparse
+import json
+import os
+import time
+
+# no window or audio device needed
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+import pygame
+
+from . import resload
+from . import game_main
+
+
+def parse_args():
+    p = argparse.ArgumentParser(
+        description="Profile resource loading: read/decode time, decoded size and format"
+    )
+    p.add_argument("--by", choices=("dir", "file"), default="dir", help="Aggregate by directory or list files (default: dir)")
+    p.add_argument("--sort", choices=("time", "bytes"), default="time", help="Sort rows by total time or decoded size (default: time)")
+    p.add_argument("--top", type=int, default=0, help="Only print the first N rows (default: all)")
+    p.add_argument("--json", type=str, default="", help="Also write per-file records and aggregates as JSON to this path ('-' for stdout)")
+    # the game's own flags are read by game_main, ignore them here
+    args, _unknown = p.parse_known_args()
+    return args
+
+
+def aggregate(profile: dict[str, dict], by: str) -> list[dict]:
+    """Fold per-file records into rows keyed by directory (or file)."""
+    rows = {}
+    for key, rec in profile.items():
+        name = key if by == "file" else (key.rpartition("/")[0] or ".")
+        row = rows.setdefault(name, {"name": name, "files": 0, "read_ms": 0.0, "decode_ms": 0.0,
+                                     "finish_ms": 0.0, "bytes": 0, "formats": set()})
+        row["files"] += 1
+        row["read_ms"] += rec.get("read_ms", 0.0)
+        row["decode_ms"] += rec.get("decode_ms", 0.0)
+        row["finish_ms"] += rec.get("finish_ms", 0.0)
+        row["bytes"] += rec.get("bytes", 0)
+        row["formats"].add(rec.get("format", "?"))
+    for row in rows.values():
+        row["total_ms"] = row["read_ms"] + row["decode_ms"] + row["finish_ms"]
+        row["formats"] = sorted(row["formats"])
+    return list(rows.values())
+
+
+def print_report(rows: list[dict], wall_s: float, tier: str, top: int = 0):
+    """Print the first top rows (all if 0); the total row always covers every row."""
+    print(f"resource tier: {tier}")
+    print(f"{'name':<32}{'files':>6}{'read ms':>10}{'decode ms':>11}{'finish ms':>11}{'total ms':>10}{'MiB':>9}  formats")
+    for row in rows[:top] if top > 0 else rows:
+        print(f"{row['name']:<32}{row['files']:>6}{row['read_ms']:>10.1f}{row['decode_ms']:>11.1f}"
+              f"{row['finish_ms']:>11.1f}{row['total_ms']:>10.1f}{row['bytes'] / 2**20:>9.1f}  {', '.join(row['formats'])}")
+    files = sum(r["files"] for r in rows)
+    total_ms = sum(r["total_ms"] for r in rows)
+    total_b = sum(r["bytes"] for r in rows)
+    print(f"{'total':<32}{files:>6}{'':>10}{'':>11}{'':>11}{total_ms:>10.1f}{total_b / 2**20:>9.1f}")
+    print(f"wall time {wall_s:.2f} s")
+
+
+def main():
+    args = parse_args()
+    pygame.init()
+    # the optimizer converts to the display format, which needs a display mode
+    pygame.display.set_mode((game_main.WIDTH, game_main.HEIGHT))
+
+    if game_main.RES_TIER not in game_main.TIERS:
+        game_main.RES_TIER = "full"
+    tier = game_main.select_tier()
+
+    resload.set_profiling(True)
+    files = game_main.resource_setup()
+    resload.set_cache_budget(None)  # measure everything, nothing gets evicted
+
+    start = time.perf_counter()
+    for item in files:
+        if game_main.RES_BUNDLE:
+            resload.load_bundled_resource(item)
+        else:
+            resload.load_resource(item, game_main.RES_DIR)
+    wall_s = time.perf_counter() - start
+
+    profile = resload.get_load_profile()
+    rows = aggregate(profile, args.by)
+    rows.sort(key=lambda r: r["total_ms"] if args.sort == "time" else r["bytes"], reverse=True)
+
+    if args.json:
+        data = json.dumps({"tier": tier, "wall_s": wall_s, "files": profile, "rows": rows}, indent=2)
+        if args.json == "-":
+            print(data)
+        else:
+            with open(args.json, "w") as f:
+                f.write(data)
+
+    if args.json != "-":
+        print_report(rows, wall_s, tier, args.top)
+
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+from collections import OrderedDict
+import weakref
+import pygame
+from . import resload
+
+"""
+pygametest.rotations - shared cache of rotated images.
+
+Provides:
+- get_rotated(surf, angle)
+- set_rotation_cache(step=1.0, budget_bytes=32 MiB)
+- get_stats()
+- clear()
+
+Angles are quantized to multiples of `step` degrees, so an image spinning at any
+speed only ever needs 360 / step rotations, and every entity using the same
+source Surface shares them. Rotations are kept in least-recently-used order and
+the oldest are dropped once their decoded size exceeds the budget. Entries of a
+source Surface go away with it.
+"""
+
+
+# internal state
+_step = 1.0
+_budget: int | None = 32 * 1024 * 1024
+_cache: "OrderedDict[tuple[int, int], tuple[pygame.Surface, int]]" = OrderedDict()  # (id(src), step index) -> (rotated, bytes)
+_tracked = weakref.WeakSet()  # sources with a finalizer that drops their entries
+_stats = {"bytes": 0, "hits": 0, "misses": 0, "evictions": 0}
+
+
+def set_rotation_cache(step: float = 1.0, budget_bytes: int | None = 32 * 1024 * 1024):
+    """Set the angle quantization in degrees and the cache budget (None = unbounded)."""
+    global _step, _budget
+    if step != _step:
+        clear()
+    _step = step
+    _budget = budget_bytes
+    _evict()
+
+
+def get_rotated(surf: pygame.Surface, angle: float) -> pygame.Surface:
+    """Return surf rotated counterclockwise by angle (like pygame.transform.rotate), rounded to the step."""
+    count = max(1, round(360 / _step))
+    index = round(angle / _step) % count
+    if index == 0:
+        return surf
+    key = (id(surf), index)
+    entry = _cache.get(key)
+    if entry is not None:
+        _cache.move_to_end(key)
+        _stats["hits"] += 1
+        return entry[0]
+
+    _stats["misses"] += 1
+    rotated = pygame.transform.rotate(surf, index * _step)
+    if surf not in _tracked:
+        _tracked.add(surf)
+        weakref.finalize(surf, _forget, id(surf))
+    size = resload.resource_size(rotated)
+    _cache[key] = (rotated, size)
+    _stats["bytes"] += size
+    _evict()
+    return rotated
+
+
+def _forget(src_id: int):
+    # the source Surface died, its rotations can never be asked for again
+    for key in [k for k in _cache if k[0] == src_id]:
+        _stats["bytes"] -= _cache.pop(key)[1]
+
+
+def _evict():
+    while _budget is not None and _stats["bytes"] > _budget and len(_cache) > 1:
+        _key, (_rotated, size) = _cache.popitem(last=False)
+        _stats["bytes"] -= size
+        _stats["evictions"] += 1
+
+
+def get_stats() -> dict:
+    """Return cache counters: bytes, hits, misses, evictions, entry count and step."""
+    return {**_stats, "count": len(_cache), "step": _step, "budget": _budget}
+
+
+def clear():
+    """Drop all cached rotations."""
+    _cache.clear()
+    _stats["bytes"] = 0
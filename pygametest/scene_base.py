@@ -1,8 +1,21 @@
 from __future__ import annotations
 from typing import Any, Dict, Optional
 import abc
+import bisect
+import weakref
 import pygame
 
+from .resload import resources_ready, screen_rect
+from .entity import Entity
+
+_KEY_EVENTS = (pygame.KEYDOWN, pygame.KEYUP)
+_REDRAWN = weakref.WeakKeyDictionary()  # Surface -> times it was redrawn in place (surface_redrawn)
+
+
+def surface_redrawn(surf) -> None:
+    """Tell render_dirty() that surf was drawn into since it was last blitted, so its blits count as changed."""
+    _REDRAWN[surf] = _REDRAWN.get(surf, 0) + 1
+
 class Scene(abc.ABC):
     """
     Base class for a game scene.
@@ -11,8 +24,14 @@ class Scene(abc.ABC):
       - subclass and implement update()
       - override init() / teardown() to allocate / free resources
       - optionally override handle_event() and render()
+      - list the resources the scene uses in MANIFEST (keys or globs, see
+        resload.resolve_manifest) so the game loads them before enter(), and
+        the manifests of likely next scenes in PRELOAD so they load in the background
     """
 
+    MANIFEST: tuple = ()
+    PRELOAD: tuple = ()
+
     def __init__(self, name: Optional[str] = None, manager: Any = None) -> None:
         self.name = name or self.__class__.__name__
         self.manager = manager  # optional scene manager / game reference
@@ -21,10 +40,14 @@ class Scene(abc.ABC):
         self.resources: Dict[str, Any] = {}
         self.width = manager.width
         self.height = manager.height
-        self.entities = []
+        self.entities = EntityRegistry()
         self.cam_min = pygame.math.Vector2(0, 0)
         self.cam_max = pygame.math.Vector2(0, 0)
         self.cam_pos = pygame.math.Vector2(0, 0)
+        # dirty-rect rendering (render_dirty): draw ops and camera of the last frame
+        self._dirty_ops = None
+        self._dirty_cam = None
+        self._dirty_capable = True
 
     def enter(self) -> None:
         """
@@ -33,47 +56,83 @@ class Scene(abc.ABC):
         """
         self.active = True
 
+    async def wait_ready(self) -> None:
+        """Await until everything in MANIFEST is loaded (for async/pygbag code paths)."""
+        await resources_ready(self.MANIFEST)
+
     def exit(self) -> None:
         """
         Called when the scene is stopped/removed.
         Override to free resources, stop sounds, cancel timers, etc.
-        Default implementation clears stored resources.
+        Default implementation clears stored resources and releases entity resources.
         """
         self.active = False
         self.resources.clear()
+        for ent in self.entities:
+            release_fn = getattr(ent, "release", None)
+            if callable(release_fn):
+                release_fn()
 
     @abc.abstractmethod
     def update(self, dt: float) -> None:
-        for ent in self.entities:
-            if ent is None:
-                continue
-            # prefer custom update(dt)
-            update_fn = getattr(ent, "update", None)
-            if callable(update_fn):
-                update_fn(dt)
+        for update_fn in self.entities.update_fns[:]:
+            update_fn(dt)
 
     def handle_event(self, event: Any) -> None:
-        for ent in self.entities:
-            if ent is None:
-                continue
-            # prefer custom handle_event(event)
-            handle_fn = getattr(ent, "handle_event", None)
-            if callable(handle_fn):
-                handle_fn(event)
+        for handle_fn in self.entities.handlers_for(event):
+            handle_fn(event)
 
     def render(self, surface: Any) -> None:
-        """Render entities. Entities may implement render(surface), draw(surface), or have image/rect."""
-        # render in order of z attribute if present
-        entities = sorted(self.entities, key=lambda e: getattr(e, "z", 0))
-        for ent in entities:
-            if ent is None:
-                continue
-            # prefer custom draw(surface, cam_pos)
-            draw_fn = getattr(ent, "draw", None)
-            if callable(draw_fn):
-                draw_fn(surface, self.cam_pos)
-            elif hasattr(ent, "image") and hasattr(ent, "rect"):
-                surface.blit(ent.image, ent.rect)
+        """Render entities in z order. Entities may implement draw(surface, cam_pos) or have image/rect."""
+        cam_pos = self.cam_pos
+        for draw_fn in self.entities.draw_fns[:]:
+            draw_fn(surface, cam_pos)
+
+    def render_dirty(self, surface: Any) -> list:
+        """
+        Like render(), but only redraw what changed since the last call, for
+        pygame.display.update(). Returns the changed screen rects.
+
+        The frame is first rendered into a recorder that only notes each blit and
+        fill. Draw ops that are not exactly the same as last frame (same Surface
+        object, position and flags) mark their old and new areas dirty, and render()
+        then runs again clipped to those areas. Falls back to a full redraw on the
+        first frame, when the camera moved, when most of the screen changed, or if
+        render() draws with anything the recorder does not support (pygame.draw).
+        Surfaces modified in place are not noticed unless reported with
+        surface_redrawn(), otherwise call invalidate() after that.
+        """
+        screen = surface.get_rect()
+        ops = None
+        if self._dirty_capable:
+            recorder = _DrawRecorder(screen.size)
+            try:
+                self.render(recorder)
+                ops = recorder.ops
+            except (TypeError, AttributeError):
+                self._dirty_capable = False
+
+        rects = None
+        if ops is not None and self._dirty_ops is not None and self.cam_pos == self._dirty_cam:
+            changed = set(ops).symmetric_difference(self._dirty_ops)
+            rects = _merge_rects([pygame.Rect(op[2]).inflate(2, 2).clip(screen) for op in changed])
+            if sum(r.w * r.h for r in rects) > screen.w * screen.h // 2:
+                rects = None
+        self._dirty_ops = ops
+        self._dirty_cam = pygame.math.Vector2(self.cam_pos)
+
+        if rects is None:
+            self.render(surface)
+            return [screen]
+        for rect in rects:
+            surface.set_clip(rect)
+            self.render(surface)
+        surface.set_clip(None)
+        return rects
+
+    def invalidate(self) -> None:
+        """Make the next render_dirty() redraw the whole screen."""
+        self._dirty_ops = None
 
     def pause(self) -> None:
         """Pause the scene's updates (update should typically early-return when paused)."""
@@ -81,4 +140,237 @@ class Scene(abc.ABC):
 
     def resume(self) -> None:
         """Resume updates."""
-        self.paused = False
\ No newline at end of file
+        self.paused = False
+
+class EntityRegistry:
+    """
+    The entities of a scene, kept in z-ordered buckets (the entity's `z` attribute
+    when added, 0 if it has none; change it with set_z()).
+
+    The methods each phase calls are looked up once, when an entity is added,
+    and kept as flat lists: update_fns in insertion order, draw_fns in z order
+    (insertion order within a z). Adding, removing or moving an entity only
+    inserts or removes its own entries (found by bisect on the order it was
+    added), so building a scene of n entities costs O(n log n) lookups, not a
+    rebuild per entity. The lists are modified in place; Scene iterates over
+    copies, so entities may be added or removed from an update or draw call.
+    Methods assigned to an entity after it was added are not picked up.
+
+    Events are routed by subscription: an entity gets the event types in its
+    EVENT_TYPES (None = every event) and, for KEYDOWN/KEYUP, only the keys in
+    its event_keys if it has them. handlers_for() caches the handler list per
+    event type (and key). Entities that keep Entity's no-op handle_event get no events.
+    Iterating the registry yields the entities in insertion order, like a list.
+    """
+
+    def __init__(self) -> None:
+        self._entities = []
+        self._seq = {}  # entity -> insertion number, only ever grows
+        self._next_seq = 0
+        self._z = {}  # entity -> z
+        self._draw = {}  # entity -> draw fn, for entities that draw
+        self._buckets = {}  # z -> insertion numbers of the drawing entities at that z, sorted
+        self._z_order = []  # sorted z values with a bucket
+        self.update_fns = []
+        self._update_seqs = []  # insertion numbers matching update_fns
+        self.draw_fns = []
+        self._event_subs = []  # (handle_event, types or None, keys or None), insertion order
+        self._event_seqs = []  # insertion numbers matching _event_subs
+        self._routes = {}  # event type or (type, key) -> handlers
+        self.version = 0  # bumped whenever the entities or their subscriptions change
+
+    def __iter__(self):
+        return iter(self._entities)
+
+    def __len__(self) -> int:
+        return len(self._entities)
+
+    def __contains__(self, ent) -> bool:
+        return ent in self._z
+
+    def append(self, ent) -> None:
+        """Add an entity at its z (None is ignored)."""
+        if self._add(ent):
+            self._changed()
+
+    def extend(self, ents) -> None:
+        added = False
+        for ent in ents:
+            added = self._add(ent) or added
+        if added:
+            self._changed()
+
+    def remove(self, ent) -> None:
+        self._entities.remove(ent)
+        self._take(ent)
+        self._draw.pop(ent, None)
+        seq = self._seq.pop(ent)
+        for fns, seqs in ((self.update_fns, self._update_seqs), (self._event_subs, self._event_seqs)):
+            i = bisect.bisect_left(seqs, seq)
+            if i < len(seqs) and seqs[i] == seq:
+                del fns[i]
+                del seqs[i]
+        self._changed()
+
+    def clear(self) -> None:
+        version = self.version
+        self.__init__()
+        self.version = version + 1
+
+    def set_z(self, ent, z) -> None:
+        """Move an entity to another z (and set its `z` attribute if it can have one)."""
+        try:
+            ent.z = z
+        except AttributeError:
+            pass  # read-only z (a property), the registry keeps it
+        if self._z.get(ent) == z:
+            return
+        self._take(ent)
+        self._put(ent, z)
+        self._changed()
+
+    def z_of(self, ent):
+        return self._z[ent]
+
+    def _add(self, ent) -> bool:
+        if ent is None or ent in self._z:
+            return False
+        seq = self._next_seq
+        self._next_seq += 1
+        self._seq[ent] = seq
+        self._entities.append(ent)
+        # a new entity always comes last in insertion order
+        update_fn = getattr(ent, "update", None)
+        if callable(update_fn):
+            self.update_fns.append(update_fn)
+            self._update_seqs.append(seq)
+        handle_fn = getattr(ent, "handle_event", None)
+        if callable(handle_fn) and getattr(type(ent), "handle_event", None) is not Entity.handle_event:
+            types = getattr(ent, "EVENT_TYPES", None)
+            keys = getattr(ent, "event_keys", None)
+            self._event_subs.append((handle_fn, None if types is None else frozenset(types),
+                                     None if keys is None else frozenset(keys)))
+            self._event_seqs.append(seq)
+        draw_fn = getattr(ent, "draw", None)
+        if callable(draw_fn):
+            self._draw[ent] = draw_fn
+        elif hasattr(ent, "image") and hasattr(ent, "rect"):
+            self._draw[ent] = _blit_drawer(ent)
+        self._put(ent, getattr(ent, "z", 0))
+        return True
+
+    def _draw_index(self, z, bucket_index: int) -> int:
+        # position in draw_fns of the bucket_index-th drawing entity at z
+        index = bucket_index
+        for other in self._z_order:
+            if other >= z:
+                break
+            index += len(self._buckets[other])
+        return index
+
+    def _put(self, ent, z) -> None:
+        self._z[ent] = z
+        draw_fn = self._draw.get(ent)
+        if draw_fn is None:
+            return
+        bucket = self._buckets.get(z)
+        if bucket is None:
+            bucket = self._buckets[z] = []
+            bisect.insort(self._z_order, z)
+        seq = self._seq[ent]
+        i = bisect.bisect_left(bucket, seq)  # keep insertion order inside the bucket
+        bucket.insert(i, seq)
+        self.draw_fns.insert(self._draw_index(z, i), draw_fn)
+
+    def _take(self, ent) -> None:
+        z = self._z.pop(ent)
+        if ent not in self._draw:
+            return
+        bucket = self._buckets[z]
+        i = bisect.bisect_left(bucket, self._seq[ent])
+        del self.draw_fns[self._draw_index(z, i)]
+        del bucket[i]
+        if not bucket:
+            del self._buckets[z]
+            self._z_order.remove(z)
+
+    def _changed(self) -> None:
+        self._routes = {}
+        self.version += 1
+
+    def handlers_for(self, event) -> list:
+        """handle_event methods subscribed to this event, in insertion order."""
+        etype = event.type
+        route = (etype, event.key) if etype in _KEY_EVENTS else etype
+        handlers = self._routes.get(route)
+        if handlers is None:
+            key = event.key if etype in _KEY_EVENTS else None
+            handlers = self._routes[route] = [
+                handle_fn for handle_fn, types, keys in self._event_subs
+                if (types is None or etype in types) and (key is None or keys is None or key in keys)
+            ]
+        return handlers
+
+    def subscribed_types(self):
+        """Event types some entity subscribes to, or None if one takes every event."""
+        types = set()
+        for _handle_fn, sub_types, _keys in self._event_subs:
+            if sub_types is None:
+                return None
+            types |= sub_types
+        return types
+
+
+def _blit_drawer(ent):
+    # draw() for entities that only have image and rect
+    def draw(surface, _cam_pos):
+        surface.blit(ent.image, screen_rect(ent.rect))
+    return draw
+
+
+class _DrawRecorder:
+    """Stand-in target surface for render_dirty(): records blits and fills instead of drawing."""
+
+    def __init__(self, size) -> None:
+        self.size = size
+        self.ops = []  # (source or fill color, redraw count, (x, y, w, h), special_flags)
+
+    def get_size(self):
+        return self.size
+
+    def get_width(self) -> int:
+        return self.size[0]
+
+    def get_height(self) -> int:
+        return self.size[1]
+
+    def get_rect(self, **kwargs):
+        rect = pygame.Rect((0, 0), self.size)
+        for name, value in kwargs.items():
+            setattr(rect, name, value)
+        return rect
+
+    def fill(self, color, rect=None, special_flags=0):
+        rect = pygame.Rect(rect) if rect is not None else pygame.Rect((0, 0), self.size)
+        self.ops.append((tuple(pygame.Color(color)), 0, tuple(rect), special_flags))
+        return rect
+
+    def blit(self, source, dest, area=None, special_flags=0):
+        size = pygame.Rect(area).size if area is not None else source.get_size()
+        rect = pygame.Rect(int(dest[0]), int(dest[1]), *size)
+        self.ops.append((source, _REDRAWN.get(source, 0), tuple(rect), special_flags))
+        return rect
+
+
+def _merge_rects(rects: list) -> list:
+    """Union overlapping rects until none overlap."""
+    merged = []
+    for rect in rects:
+        if not rect.w or not rect.h:
+            continue
+        i = rect.collidelist(merged)
+        while i != -1:
+            rect = rect.union(merged.pop(i))
+            i = rect.collidelist(merged)
+        merged.append(rect)
+    return merged
@@ -1,7 +1,8 @@
 from . import scene_base
 from . import music
-from .resload import get_resource
+from .resload import get_resource, blit_flags, logical_size
 from .ent_button import Button
+from .fonts import get_font
 import math
 
 import pygame
@@ -13,6 +14,7 @@ class SceneCredits(scene_base.Scene):
     """
     Gameplay scene:
     """
+    MANIFEST = ("title/*",)
     def __init__(self, manager: Any = None):
         super().__init__("gameplay", manager)
         self.bg_color = pygame.Color("darkslateblue")
@@ -24,11 +26,11 @@ class SceneCredits(scene_base.Scene):
 
         self.entities.append(
             Button(
-            1920/8-get_resource("title/button_bg.png").get_width()/8, 850,
+            1920/8-logical_size(get_resource("title/button_bg.png"))[0]/8, 850,
             get_resource("title/restart.png"),
             "",
             callback=lambda: self.on_title(),
-            font=pygame.font.SysFont("Arial", 50)
+            font=get_font("Arial", 50)
             )
         )
 
@@ -63,6 +65,6 @@ class SceneCredits(scene_base.Scene):
 
     def render(self, surface: pygame.Surface):
         surface.fill(self.bg_color)
-        surface.blit(self.bg_image, (0, 0))
+        surface.blit(self.bg_image, (0, 0), special_flags=blit_flags(self.bg_image))
         sw, sh = surface.get_size()
         super().render(surface)
\ No newline at end of file
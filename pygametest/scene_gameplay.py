@@ -2,9 +2,12 @@ import math
 from pygametest.ent_bar import Bar
 from . import scene_base
 from . import music
-from .resload import get_resource
+from .resload import get_resource, blit_flags, logical_size, to_screen
 from .entity import Entity
 from .ent_guy import LittleGuy
+from .ent_animspr import AnimatedSprite
+from .ent_parallax import ParallaxBackground
+from .collision import CollisionWorld, LAYER_HURTBOX, LAYER_HITBOX
 
 import pygame
 import sys
@@ -20,6 +23,16 @@ class SceneGameplay(scene_base.Scene):
     """
     Gameplay scene:
     """
+    MANIFEST = (
+        "bgm/loop.mp3",
+        "bgs/new3.png", "bgs/crowd/*", "bgs/ring.png", "bgs/hud.png", "bgs/hud_heart.png",
+        # death frames are only needed at round end, LittleGuy streams them in
+        "chr/[01]/idle/*", "chr/[01]/walk/*", "chr/[01]/punch/*", "chr/[01]/kick/*",
+        "chr/[01]/block/*", "chr/[01]/hit/*",
+        # or the atlas pages when the characters were packed with resize_assets.py --atlas
+        "chr/[01]/atlas*",
+    )
+    PRELOAD = ("title/*", "bgm/menu_prev.mp3")
     def __init__(self, manager: Any = None):
         super().__init__("gameplay", manager)
 
@@ -42,7 +55,6 @@ class SceneGameplay(scene_base.Scene):
 
         self.lower_bg = Entity((-255, 0), get_resource("bgs/new3.png"), group=self.bg_group)
         self.lower_bg.parallax = 0.5
-        self.entities.append(self.lower_bg)
 
         #self.middle_bg = Entity((-255, 0), get_resource("bgs/new1.png"), group=self.bg_group)
         #self.middle_bg.parallax = 0.63
@@ -53,18 +65,26 @@ class SceneGameplay(scene_base.Scene):
 
         self.middle_bg = Entity((-275, 150), self.crowd_imgs[0], group=self.bg_group)
         self.middle_bg.parallax = 0.63
-        self.entities.append(self.middle_bg)
 
 
         self.main_bg = Entity((-275, 1080-500), get_resource("bgs/ring.png"), group=self.bg_group)
         self.main_bg.parallax = 0.8
-        self.entities.append(self.main_bg)
+
+        # the three layers are pre-blended into cached opaque buffers, one blit per frame
+        self.background = ParallaxBackground([self.lower_bg, self.middle_bg, self.main_bg], self.bg_color)
+        self.entities.append(self.background)
 
         self.ent_p1 = LittleGuy(0, False, (400, 1000-LittleGuy.DIM_Y,))
         self.ent_p2 = LittleGuy(1, True, (1920-400-LittleGuy.DIM_X, 1000-LittleGuy.DIM_Y,))
         self.entities.append(self.ent_p1)
         self.entities.append(self.ent_p2)
 
+        # fighters are hurt through their rect and hit with their attack hitbox
+        self.collisions = CollisionWorld()
+        for ent in (self.ent_p1, self.ent_p2):
+            self.collisions.add(ent, LAYER_HURTBOX)
+            self.collisions.add(ent, LAYER_HITBOX, LAYER_HURTBOX, shape="hitbox")
+
         self.hud_bg = Entity((0, 0), get_resource("bgs/hud.png"), group=self.hud_group)
         self.hud_bg.scroll = False
         self.ent_p1l = Bar((80, 68), (728, 32), max_value=MAX_HEALTH, current_value=MAX_HEALTH, group=self.hud_group)
@@ -82,6 +102,7 @@ class SceneGameplay(scene_base.Scene):
 
     def exit(self):
         music.fadeout(1000)
+        super().exit()
 
     def pause(self):
         super().pause()
@@ -103,12 +124,7 @@ class SceneGameplay(scene_base.Scene):
         crowd_seq = [0, 1, 2, 1]
         self.middle_bg.image = self.crowd_imgs[crowd_seq[int((self.crowd_timer*3 ) % 4)]]
 
-        if self.ent_p1.hitbox is not None:
-            if self.ent_p1.hitbox.colliderect(self.ent_p2.rect):
-                self.ent_p2.receive_hit(self.ent_p1.hit_damage, 50)
-        if self.ent_p2.hitbox is not None:
-            if self.ent_p2.hitbox.colliderect(self.ent_p1.rect):
-                self.ent_p1.receive_hit(self.ent_p2.hit_damage, 50)
+        self.collisions.step()  # LittleGuy.on_collision deals the hits
 
         # update internal stats
         self.p1_health = self.ent_p1.health
@@ -178,11 +194,13 @@ class SceneGameplay(scene_base.Scene):
         surface.fill(self.bg_color)
         super().render(surface)
 
+        heart_flags = blit_flags(self.heart_icon)
+        heart_step = logical_size(self.heart_icon)[0] + 15
         for i in range(self.p1_lives):
-            surface.blit(self.heart_icon, (70 + i * (self.heart_icon.get_width() + 15), 157))
+            surface.blit(self.heart_icon, to_screen(70 + i * heart_step, 157), special_flags=heart_flags)
 
         for i in range(self.p2_lives):
-            surface.blit(self.heart_icon, (1802 - i * (self.heart_icon.get_width() + 15), 157))
+            surface.blit(self.heart_icon, to_screen(1802 - i * heart_step, 157), special_flags=heart_flags)
 
         if DBG_GAMEPLAY:
             self.render_debug_info(surface)
@@ -194,6 +212,9 @@ class SceneGameplay(scene_base.Scene):
         # basic scene info
         lines.append(f"inv_flip: {self.inv_flip}")
 
+        stream = AnimatedSprite.stream_stats
+        lines.append(f"anim stream: {stream['adopted']} adopted, {stream['stalls']} stalls ({stream['stall_ms']:.0f} ms)")
+
         lines.append(f"camera pos: {self.cam_pos.x},{self.cam_pos.y}")
 
         # player positions if available
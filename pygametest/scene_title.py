@@ -3,8 +3,9 @@ from pygametest.scene_options import SceneOptions
 from pygametest.scene_credits import SceneCredits
 from . import scene_base
 from . import music
-from .resload import get_resource
+from .resload import get_resource, blit_flags, logical_size, tier_scale
 from .ent_button import Button
+from .fonts import get_font
 import math
 
 import pygame
@@ -16,6 +17,8 @@ class SceneTitle(scene_base.Scene):
     """
     Gameplay scene:
     """
+    MANIFEST = ("title/*", "bgm/menu_prev.mp3")
+    PRELOAD = SceneGameplay.MANIFEST
     def __init__(self, manager: Any = None):
         super().__init__("gameplay", manager)
         self.bg_color = pygame.Color("darkslateblue")
@@ -29,7 +32,7 @@ class SceneTitle(scene_base.Scene):
         music.set_bgm_volume(BGM_VOL)
         self.entities.append(
             Button(
-            1920/2-get_resource("title/play.png").get_width()/2, 500,
+            1920/2-logical_size(get_resource("title/play.png"))[0]/2, 500,
             get_resource("title/play.png"),
             "",
             callback=lambda: self.on_play()
@@ -38,21 +41,21 @@ class SceneTitle(scene_base.Scene):
 
         self.entities.append(
             Button(
-            1920/2-get_resource("title/button_bg.png").get_width()/2, 850,
+            1920/2-logical_size(get_resource("title/button_bg.png"))[0]/2, 850,
             get_resource("title/button_bg.png"),
             "opções",
             callback=lambda: self.on_options(),
-            font=pygame.font.SysFont("Arial", 50)
+            font=get_font("Arial", 50)
             )
         )
 
         self.entities.append(
             Button(
-            1920/2-get_resource("title/button_bg.png").get_width()/2, 675,
+            1920/2-logical_size(get_resource("title/button_bg.png"))[0]/2, 675,
             get_resource("title/button_bg.png"),
             "Créditos",
             callback=lambda: self.on_credits(), 
-            font=pygame.font.SysFont("Arial", 50)
+            font=get_font("Arial", 50)
             )
         )
 
@@ -93,8 +96,8 @@ class SceneTitle(scene_base.Scene):
 
     def render(self, surface: pygame.Surface):
         surface.fill(self.bg_color)
-        surface.blit(self.bg_image, (0, 0))
+        surface.blit(self.bg_image, (0, 0), special_flags=blit_flags(self.bg_image))
         sw, sh = surface.get_size()
         iw, ih = self.main_image.get_size()
-        surface.blit(self.main_image, ((sw - iw) // 2, (sh - ih) // 2 - 180 + math.sin(self.time) * 20))
+        surface.blit(self.main_image, ((sw - iw) // 2, (sh - ih) // 2 + (-180 + math.sin(self.time) * 20) * tier_scale()), special_flags=blit_flags(self.main_image))
         super().render(surface)
\ No newline at end of file
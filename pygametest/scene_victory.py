@@ -8,6 +8,9 @@ import pygame
 
 class SceneVictory(scene_base.Scene):
 
+    MANIFEST = ("title/bg.png",)
+    PRELOAD = ("title/*", "bgm/menu_prev.mp3")
+
     def __init__(self, winner:int, manager = None):
         super().__init__("victory", manager)
 
@@ -1,5 +1,10 @@
 from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor, as_completed
 import argparse
+import hashlib
+import io
+import json
+import os
 import sys
 import pygame
 
@@ -9,8 +14,27 @@ resize_assets.py
 
 Parse source and destination directories from the command line, validate them,
 and prepare the destination directory for writing resized assets.
+
+Images are processed in parallel by a process pool. A build manifest in the
+destination directory (MANIFEST_NAME) records the source mtime, size and hash
+and the options each output was built with, so re-runs only rebuild outputs
+whose source or options changed. Outputs of sources that were removed or are
+now excluded get deleted.
+
+With --atlas the resized frames are kept in a hidden FRAMES_DIR build cache and
+each animation directory is packed into shared atlas pages (atlas_<n>.png) with
+a frame table ATLAS_NAME that resload.get_atlas_table reads:
+  {"pages": [...], "animations": {name: [{"page", "rect", "trim"}, ...]}}
+Frames are listed in file name order. "rect" is the (x, y, w, h) of the frame's
+visible pixels on its page and "trim" is (x, y, source w, source h), where the
+crop sat in the original frame. Identical frames share one rect.
 """
 
+MANIFEST_NAME = ".build_manifest.json"
+FRAMES_DIR = ".frames"
+ATLAS_NAME = "atlas.json"
+ATLAS_PADDING = 4  # transparent pixels around each frame, so scaled pages don't bleed
+
 
 
 def parse_args():
@@ -41,9 +65,148 @@ def parse_args():
         default=0,
         help="Pixel value to crop from the bottom of the source image (default: 0)"
     )
+    p.add_argument(
+        "--jobs",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="Worker processes (default: CPU count)"
+    )
+    p.add_argument(
+        "--atlas",
+        action="store_true",
+        help="Pack the resized frames into atlas pages with a JSON frame table"
+    )
+    p.add_argument(
+        "--atlas-size",
+        type=int,
+        default=4096,
+        help="Maximum atlas page width and height (default: 4096)"
+    )
+    p.add_argument(
+        "--force",
+        action="store_true",
+        help="Rebuild every output, ignoring the build manifest"
+    )
     return p.parse_args()
 
 
+def load_manifest(dst: Path) -> dict:
+    try:
+        with open(dst / MANIFEST_NAME) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_manifest(dst: Path, manifest: dict):
+    tmp = dst / (MANIFEST_NAME + ".tmp")
+    with open(tmp, "w") as f:
+        json.dump(manifest, f, indent=1, sort_keys=True)
+    os.replace(tmp, dst / MANIFEST_NAME)
+
+
+def file_hash(data: bytes) -> str:
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+def is_up_to_date(entry: dict | None, file: Path, destpath: Path, options: dict) -> bool:
+    """
+    True if destpath was built from the current contents of file with the same options.
+    The hash is only computed when the source mtime or size changed; entry is
+    refreshed in place when the file was touched without changing.
+    """
+    if entry is None or entry.get("options") != options or not destpath.exists():
+        return False
+    st = file.stat()
+    if entry.get("mtime") == st.st_mtime_ns and entry.get("size") == st.st_size:
+        return True
+    if entry.get("hash") != file_hash(file.read_bytes()):
+        return False
+    entry["mtime"] = st.st_mtime_ns
+    entry["size"] = st.st_size
+    return True
+
+
+def process_file(file: Path, destpath: Path, scale_factor: float, crop_bottom: int) -> dict:
+    """Load, crop and resize one image. Runs in a worker process; returns its manifest entry."""
+    data = file.read_bytes()
+    st = file.stat()
+    # load the image and resize it, using pygame
+    surf = pygame.image.load(io.BytesIO(data), file.name)
+    if crop_bottom > 0:
+        surf = surf.subsurface((0, 0, surf.get_width(), surf.get_height() - crop_bottom))
+    surf = pygame.transform.scale(surf, (int(surf.get_width() * scale_factor), int(surf.get_height() * scale_factor)))
+    destpath.parent.mkdir(parents=True, exist_ok=True)
+    pygame.image.save(surf, destpath)
+    return {"src": str(file), "mtime": st.st_mtime_ns, "size": st.st_size, "hash": file_hash(data)}
+
+
+def remove_atlas(dst: Path):
+    try:
+        with open(dst / ATLAS_NAME) as f:
+            pages = json.load(f)["pages"]
+    except (OSError, ValueError, KeyError):
+        return
+    for name in pages:
+        (dst / name).unlink(missing_ok=True)
+    (dst / ATLAS_NAME).unlink()
+    print(f"Removed atlas {dst / ATLAS_NAME}")
+
+
+def pack_atlas(frames_dir: Path, keys: list[str], dst: Path, max_size: int):
+    """Shelf-pack the visible part of each frame (keys are "<animation>/<file>") into atlas pages."""
+    remove_atlas(dst)
+    crops = {}  # pixel hash -> cropped frame
+    animations = {}
+    for key in sorted(keys):
+        surf = pygame.image.load(frames_dir / key)
+        rect = surf.get_bounding_rect(min_alpha=1)
+        if rect.width == 0 or rect.height == 0:
+            rect = pygame.Rect(0, 0, 1, 1)
+        crop = surf.subsurface(rect)
+        digest = file_hash(pygame.image.tobytes(crop, "RGBA") + repr(rect.size).encode())
+        crops.setdefault(digest, crop)
+        entry = {"hash": digest, "trim": [rect.x, rect.y, surf.get_width(), surf.get_height()]}
+        animations.setdefault(key.split("/")[0], []).append(entry)
+
+    # tallest first, left to right on shelves, new page when one is full
+    placed = {}  # pixel hash -> (page, x, y)
+    page_sizes = []
+    x = y = shelf_h = 0
+    for digest, crop in sorted(crops.items(), key=lambda item: (-item[1].get_height(), -item[1].get_width())):
+        w, h = crop.get_width() + ATLAS_PADDING, crop.get_height() + ATLAS_PADDING
+        if w + ATLAS_PADDING > max_size or h + ATLAS_PADDING > max_size:
+            raise ValueError(f"frame of {crop.get_size()} does not fit in a {max_size} atlas page")
+        if not page_sizes or x + w + ATLAS_PADDING > max_size:
+            x, y, shelf_h = 0, y + shelf_h, 0
+        if not page_sizes or y + h + ATLAS_PADDING > max_size:
+            page_sizes.append([0, 0])
+            x = y = shelf_h = 0
+        placed[digest] = (len(page_sizes) - 1, x + ATLAS_PADDING, y + ATLAS_PADDING)
+        page_sizes[-1][0] = max(page_sizes[-1][0], x + w + ATLAS_PADDING)
+        page_sizes[-1][1] = max(page_sizes[-1][1], y + h + ATLAS_PADDING)
+        x += w
+        shelf_h = max(shelf_h, h)
+
+    pages = [pygame.Surface(size, pygame.SRCALPHA) for size in page_sizes]
+    for digest, (n, px, py) in placed.items():
+        # max against the transparent page copies the pixels without blending
+        pages[n].blit(crops[digest], (px, py), special_flags=pygame.BLEND_RGBA_MAX)
+    names = [f"atlas_{n}.png" for n in range(len(pages))]
+    for name, page in zip(names, pages):
+        pygame.image.save(page, dst / name)
+        print(f"Wrote atlas page {dst / name} ({page.get_width()}x{page.get_height()})")
+
+    for frames in animations.values():
+        for i, entry in enumerate(frames):
+            n, px, py = placed[entry["hash"]]
+            frames[i] = {"page": n, "rect": [px, py, *crops[entry["hash"]].get_size()], "trim": entry["trim"]}
+    table = {"pages": names, "animations": animations}
+    with open(dst / ATLAS_NAME, "w") as f:
+        json.dump(table, f, separators=(",", ":"))
+    print(f"Packed {len(keys)} frames ({len(crops)} unique) into {len(pages)} atlas page(s)")
+
+
 def main():
     args = parse_args()
     src = args.src.expanduser().resolve()
@@ -68,25 +231,70 @@ def main():
     print(f"Source directory: {src}")
     print(f"Destination directory: {dst}")
 
+    options = {"scale": scale_factor, "crop_bottom": args.crop_bottom, "exclude": excludes, "atlas": args.atlas}
+    out_dir = dst / FRAMES_DIR if args.atlas else dst
+    manifest = load_manifest(dst)  # also read with --force, for the stale-output sweep
+    new_manifest = {}
+    jobs = []
+    outputs = set()  # every output of this run, built or skipped, relative to dst
+
     # for every subdir in source directory
-    for subdir in src.iterdir():
+    for subdir in sorted(src.iterdir()):
         if subdir.is_dir():
             print(f"Found subdirectory: {subdir}")
             # get all files in this dir
-            for file in subdir.iterdir():
+            for file in sorted(subdir.iterdir()):
                 if file.is_file():
-                    print(f"Found file: {file}")
                     if any(exclude in file.name for exclude in excludes):
                         print(f"Excluding file: {file}")
                         continue
-                    # load the image and resize it, using pygame
-                    surf = pygame.image.load(file)
-                    if args.crop_bottom > 0:
-                        surf = surf.subsurface((0, 0, surf.get_width(), surf.get_height() - args.crop_bottom))
-                    surf = pygame.transform.scale(surf, (int(surf.get_width() * scale_factor), int(surf.get_height() * scale_factor)))
-                    destpath = dst / subdir.name.lower() / file.name
-                    destpath.parent.mkdir(parents=True, exist_ok=True)
-                    pygame.image.save(surf, destpath)
+                    destpath = out_dir / subdir.name.lower() / file.name
+                    key = destpath.relative_to(out_dir).as_posix()
+                    outputs.add(destpath.relative_to(dst).as_posix())
+                    entry = manifest.get(key)
+                    if not args.force and is_up_to_date(entry, file, destpath, options):
+                        new_manifest[key] = entry
+                    else:
+                        jobs.append((key, file, destpath))
+
+    skipped = len(new_manifest)
+    failed = 0
+    if jobs:
+        with ProcessPoolExecutor(max_workers=max(1, args.jobs)) as pool:
+            futures = {
+                pool.submit(process_file, file, destpath, scale_factor, args.crop_bottom): (key, file, destpath)
+                for key, file, destpath in jobs
+            }
+            for fut in as_completed(futures):
+                key, file, destpath = futures[fut]
+                try:
+                    entry = fut.result()
+                except Exception as e:
+                    print(f"Error: failed to process {file}: {e}", file=sys.stderr)
+                    failed += 1
+                    continue
+                entry["options"] = options
+                entry["out"] = destpath.relative_to(dst).as_posix()
+                new_manifest[key] = entry
+                print(f"Built {key}")
+
+    # outputs of sources that are gone or now excluded, or were built for the other layout
+    stale = {entry.get("out", key) for key, entry in manifest.items()} - outputs
+    for out in sorted(stale):
+        (dst / out).unlink(missing_ok=True)
+        print(f"Removed stale {out}")
+        parent = (dst / out).parent
+        if parent != dst and parent.is_dir() and not any(parent.iterdir()):
+            parent.rmdir()
+
+    save_manifest(dst, new_manifest)
+    if not args.atlas:
+        remove_atlas(dst)
+    print(f"Built {len(jobs) - failed}, skipped {skipped} unchanged, {failed} failed")
+    if failed:
+        sys.exit(1)
+    if args.atlas and (jobs or stale or args.force or not (dst / ATLAS_NAME).exists()):
+        pack_atlas(out_dir, list(new_manifest), dst, args.atlas_size)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
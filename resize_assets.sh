@@ -1,6 +1,13 @@
 #!/usr/bin/env bash
+# extra arguments (e.g. --force, --jobs N) are passed on to resize_assets.py
 
 cd "$(dirname "$0")"
 source venv/bin/activate
-python resize_assets.py ./res_src/Kappy ./res/chr/0/ --scale 0.5 --exclude "Sheet,sheet,Idle_"
-python resize_assets.py ./res_src/Viper ./res/chr/1/ --scale 0.5 --exclude "Sheet,sheet,Idle_"
+# both characters build at once, each with half of the cores
+JOBS=$(( ($(nproc) + 1) / 2 ))
+python resize_assets.py ./res_src/Kappy ./res/chr/0/ --scale 0.5 --exclude "Sheet,sheet,Idle_" --jobs "$JOBS" "$@" &
+KAPPY=$!
+python resize_assets.py ./res_src/Viper ./res/chr/1/ --scale 0.5 --exclude "Sheet,sheet,Idle_" --jobs "$JOBS" "$@" &
+VIPER=$!
+wait $KAPPY; STATUS=$?
+wait $VIPER && exit $STATUS
@@ -0,0 +1,42 @@
+import gc
+import os
+import threading
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame
+
+from pygametest import mirrors, resload
+
+
+class _Cycle:
+    def __init__(self, surf):
+        self.surf = surf
+        self.me = self  # only the cyclic GC frees it
+
+
+def test_gc_inside_build_does_not_deadlock(monkeypatch):
+    """A tracked source freed by a GC pass while _build holds the lock must not hang its finalizer."""
+    mirrors.clear()
+    holder = _Cycle(pygame.Surface((8, 8)))
+    mirrors.get_mirrored(holder.surf, True)
+    del holder
+
+    resource_size = resload.resource_size
+
+    def collecting_size(surf):
+        gc.collect()  # frees the cycle and runs its source's finalizer
+        return resource_size(surf)
+
+    monkeypatch.setattr(resload, "resource_size", collecting_size)
+    other = pygame.Surface((4, 4))
+    worker = threading.Thread(target=mirrors.get_mirrored, args=(other, True), daemon=True)
+    worker.start()
+    worker.join(5)
+    assert not worker.is_alive()
+
+    monkeypatch.setattr(resload, "resource_size", resource_size)
+    stats = mirrors.get_stats()
+    assert stats["count"] == 1
+    assert stats["bytes"] == resource_size(mirrors.get_mirrored(other, True))
+    mirrors.clear()